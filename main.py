@@ -1,5 +1,6 @@
 # main.py
 
+from prepare_data.dir_index import set_index_cache_dir
 from prepare_data.pipeline import run_pipeline
 
 if __name__ == "__main__":
@@ -7,5 +8,6 @@ if __name__ == "__main__":
     annotations_file = "data/_annotations.coco.json"   # chemin vers ton COCO JSON brut
     images_folder = "data/images"                # dossier contenant les images
     output_file = "data/annotations_clean.json"  # fichier de sortie nettoyé#
+    set_index_cache_dir("data/.dir_index")       # index des dossiers conservés entre exécutions
 
     run_pipeline(annotations_file, images_folder, output_file)
@@ -0,0 +1,176 @@
+# modeles/benchmark.py
+
+import itertools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from modeles.inference import set_threads
+
+
+# =================== Mesures ===================
+def peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus courant (Mo)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1e6
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def summarize_latencies(latencies_ms: Sequence[float], batch: int) -> dict:
+    """Percentiles de latence par lot, latence médiane par image et débit (images/s)."""
+    lat = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        "latency_p50_ms": float(np.percentile(lat, 50)),
+        "latency_per_image_ms": float(np.percentile(lat, 50) / batch),
+        "latency_p90_ms": float(np.percentile(lat, 90)),
+        "latency_p99_ms": float(np.percentile(lat, 99)),
+        "throughput_ips": float(batch * len(lat) / (lat.sum() / 1000)),
+    }
+
+
+def pareto_front(df: pd.DataFrame, cost: str = "latency_p50_ms", gain: str = "map50_95") -> pd.Series:
+    """
+    Indique les configurations du front de Pareto : aucune autre n'est à la fois
+    plus rapide (ou aussi rapide) et plus précise (ou aussi précise).
+    """
+    c = df[cost].to_numpy(dtype=np.float64)
+    g = df[gain].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(c) & ~np.isnan(g)
+    dominated = ((c[None, :] <= c[:, None]) & (g[None, :] >= g[:, None]) &
+                 ((c[None, :] < c[:, None]) | (g[None, :] > g[:, None])) & valid[None, :]).any(axis=1)
+    return pd.Series(valid & ~dominated, index=df.index)
+
+
+def read_map_from_results_csv(results_csv: str) -> float:
+    """Lit le meilleur mAP50-95 d'un results.csv d'entraînement Ultralytics (runs/detect/...)."""
+    df = pd.read_csv(results_csv)
+    df.columns = [c.strip() for c in df.columns]
+    return float(df["metrics/mAP50-95(B)"].max())
+
+
+# =================== Exécution d'une configuration ===================
+def _load_images(images: Sequence[str], imgsz: int, n: int) -> list[np.ndarray]:
+    """Charge des images réelles (ou génère des images aléatoires) pour le benchmark."""
+    if images:
+        loaded = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in images[:n]]
+        loaded = [img for img in loaded if img is not None]
+        if loaded:
+            return loaded
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (imgsz, imgsz, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def export_model(weights: str, backend: str, imgsz: int) -> str:
+    """Exporte les poids vers backend (onnx, openvino, ...) ; renvoie le chemin du modèle à charger."""
+    if backend == "pytorch":
+        return weights
+    from modeles.modele import load_model
+    return str(load_model(weights).export(format=backend, imgsz=imgsz, dynamic=True))
+
+
+def _default_loader(model_path: str):
+    """Charge un modèle (PyTorch ou déjà exporté) via load_model."""
+    from modeles.modele import load_model
+    return load_model(model_path)
+
+
+def run_config(config: dict, loader: Optional[Callable] = None) -> dict:
+    """
+    Mesure une configuration (weights, imgsz, batch, threads, backend) sur CPU.
+    Le modèle est chargé depuis config["model_path"] (déjà exporté par run_benchmark) :
+    le pic mémoire mesuré est celui de l'inférence, pas celui de l'export.
+    La latence est mesurée par lot, après config["warmup"] itérations non comptées.
+    """
+    set_threads(config["threads"])
+    loader = loader or _default_loader
+    model = loader(config.get("model_path", config["weights"]))
+    images = _load_images(config.get("images") or [], config["imgsz"], config["batch"])
+    batch = [images[i % len(images)] for i in range(config["batch"])]
+
+    predict = lambda: model.predict(batch, imgsz=config["imgsz"], device="cpu", verbose=False)
+    for _ in range(config["warmup"]):
+        predict()
+
+    latencies = []
+    for _ in range(config["iterations"]):
+        start = time.perf_counter()
+        predict()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {**{k: config[k] for k in ("weights", "backend", "imgsz", "batch", "threads")},
+            **summarize_latencies(latencies, config["batch"]),
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def _run_isolated(config: dict) -> dict:
+    """Lance run_config dans un processus neuf (pic mémoire et threads propres à la configuration)."""
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(run_config, config).result()
+
+
+# =================== Benchmark complet ===================
+def run_benchmark(weights: Sequence[str], imgsz: Sequence[int] = (512, 640), batch: Sequence[int] = (1, 8),
+                  threads: Sequence[int] = (1, 4), backends: Sequence[str] = ("pytorch",),
+                  images: Sequence[str] = (), maps: Optional[dict] = None, warmup: int = 5,
+                  iterations: int = 30, isolate: bool = True, loader: Optional[Callable] = None,
+                  exporter: Callable = export_model, output_csv: Optional[str] = "runs/benchmark/benchmark.csv") -> pd.DataFrame:
+    """
+    Compare vitesse CPU et précision de plusieurs modèles.
+    Args :
+        weights (Sequence[str]) : fichiers de poids candidats (chargés via load_model)
+        imgsz, batch, threads, backends : valeurs balayées (produit cartésien)
+        images (Sequence[str]) : images de test (aléatoires si vide)
+        maps (dict) : mAP50-95 connu par fichier de poids (read_map_from_results_csv ou evaluate)
+        isolate (bool) : une configuration par processus (mesure du pic mémoire fiable)
+        loader (Callable) : chargeur loader(model_path) (load_model par défaut)
+        exporter (Callable) : export une seule fois par (poids, backend, imgsz), dans ce processus
+    Returns :
+        pd.DataFrame : une ligne par configuration, colonne "pareto" pour le front vitesse / précision
+                       (coût = latence médiane par image, comparable entre tailles de lot)
+    """
+    rows, exported = [], {}
+    for w, size, b, t, backend in itertools.product(weights, imgsz, batch, threads, backends):
+        if (w, backend, size) not in exported:
+            exported[(w, backend, size)] = exporter(w, backend, size)
+        config = {"weights": w, "imgsz": size, "batch": b, "threads": t, "backend": backend,
+                  "model_path": exported[(w, backend, size)],
+                  "images": list(images), "warmup": warmup, "iterations": iterations}
+        print(f"[INFO] Benchmark {Path(w).name} | {backend} | imgsz={size} batch={b} threads={t}")
+        rows.append(_run_isolated(config) if isolate and loader is None else run_config(config, loader))
+
+    df = pd.DataFrame(rows)
+    df["map50_95"] = df["weights"].map(maps or {}).astype(float)
+    df["pareto"] = pareto_front(df, cost="latency_per_image_ms")
+    df = df.sort_values(["latency_per_image_ms"]).reset_index(drop=True)
+
+    if output_csv:
+        Path(output_csv).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_csv, index=False)
+        print(f"[INFO] Résultats sauvegardés → {output_csv}")
+    print(df.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    return df
+
+
+if __name__ == "__main__":
+    ## Modèles à comparer et mAP associés (à adapter)
+    candidates = {
+        "checkpoints/yolov8n_best.pt": "runs/detect/train_8n/results.csv",
+        "checkpoints/yolov8s_best.pt": "runs/detect/train_8s/results.csv",
+        "checkpoints/yolov9s_best.pt": "runs/detect/train_9s/results.csv",
+    }
+    maps = {w: read_map_from_results_csv(csv) for w, csv in candidates.items() if Path(csv).exists()}
+    test_images = sorted(str(p) for p in Path("data/dataset_yolo/test/images").glob("*.jpg"))
+
+    run_benchmark(list(candidates), images=test_images, backends=("pytorch", "onnx", "openvino"), maps=maps)
@@ -0,0 +1,189 @@
+# modeles/cache.py
+
+import hashlib
+import json
+import sqlite3
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from modeles.inference import predict_detections
+
+
+# =================== Empreintes ===================
+def bytes_hash(data: bytes) -> str:
+    """Empreinte SHA-256 d'un contenu."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _file_hash(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def weights_hash(weights: str) -> str:
+    """
+    Empreinte SHA-256 d'un fichier de poids (mémorisée tant que taille et date ne changent pas).
+    """
+    file = Path(weights)
+    if not file.exists():
+        raise FileNotFoundError(f"Le fichier {weights} est introuvable.")
+    stat = file.stat()
+    return _file_hash(str(file.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def make_key(image_hash: str, model_hash: str, imgsz: int, conf: float, backend: str) -> str:
+    """Clé de cache : contenu de l'image + poids + paramètres d'inférence."""
+    settings = json.dumps({"imgsz": imgsz, "conf": conf, "backend": backend}, sort_keys=True)
+    return bytes_hash(f"{image_hash}:{model_hash}:{settings}".encode())
+
+
+# =================== Cache persistant ===================
+class PredictionCache:
+    """
+    Cache disque des prédictions (SQLite), adressé par contenu.
+    Quand la taille dépasse max_bytes, les entrées les moins récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, path: str = "cache/predictions.sqlite", max_bytes: int = 1 << 30):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, detections BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON predictions (last_access)")
+        self._db.commit()
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM predictions").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Valide les écritures en attente et ferme la base."""
+        self._db.commit()
+        self._db.close()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Retourne les détections (N, 6) en cache, ou None."""
+        row = self._db.execute("SELECT detections FROM predictions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (time.time(), key))
+        return np.frombuffer(row[0], dtype=np.float32).reshape(-1, 6).copy()
+
+    def put(self, key: str, detections: np.ndarray):
+        """Ajoute (ou remplace) une entrée puis applique l'éviction si nécessaire."""
+        blob = np.asarray(detections, dtype=np.float32).reshape(-1, 6).tobytes()
+        old = self._db.execute("SELECT size FROM predictions WHERE key = ?", (key,)).fetchone()
+        self._total += len(blob) + len(key) - (old[0] if old else 0)
+        self._db.execute(
+            "INSERT OR REPLACE INTO predictions (key, detections, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob) + len(key), time.time()),
+        )
+        self._evict()
+        self._db.commit()
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        while self._total > self.max_bytes:
+            oldest = self._db.execute(
+                "SELECT key, size FROM predictions ORDER BY last_access LIMIT 256").fetchall()
+            if not oldest:
+                break
+            to_delete = []
+            for key, size in oldest:
+                if self._total <= self.max_bytes:
+                    break
+                to_delete.append((key,))
+                self._total -= size
+            self._db.executemany("DELETE FROM predictions WHERE key = ?", to_delete)
+
+    def stats(self) -> dict:
+        """Statistiques : succès, échecs, taux de succès, nombre d'entrées et taille."""
+        entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM predictions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+# =================== Inférence avec cache ===================
+def predict_with_cache(model, weights: str, image_paths: list, cache: PredictionCache,
+                       imgsz: int = 512, conf: float = 0.25, backend: str = "pytorch",
+                       batch: int = 16) -> list[np.ndarray]:
+    """
+    Lance le modèle uniquement sur les images absentes du cache.
+    Args :
+        model : modèle renvoyé par load_model(weights)
+        weights (str) : fichier de poids (son empreinte fait partie de la clé)
+        image_paths (list) : chemins des images
+        cache (PredictionCache) : cache persistant
+        backend (str) : moteur d'inférence (pytorch, onnx, openvino...) inclus dans la clé
+    Returns :
+        list[np.ndarray] : détections (N, 6) par image, dans l'ordre de image_paths
+    """
+    model_hash = weights_hash(weights)
+    results = [None] * len(image_paths)
+    pending = []
+
+    def flush():
+        images = [cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) for _, _, data in pending]
+        for (idx, key, _), det in zip(pending, predict_detections(model, images, imgsz=imgsz, conf=conf)):
+            cache.put(key, det)
+            results[idx] = det
+        pending.clear()
+
+    for idx, path in enumerate(image_paths):
+        data = Path(path).read_bytes()
+        key = make_key(bytes_hash(data), model_hash, imgsz, conf, backend)
+        cached = cache.get(key)
+        if cached is not None:
+            results[idx] = cached
+            continue
+        pending.append((idx, key, data))
+        if len(pending) >= batch:
+            flush()
+    if pending:
+        flush()
+
+    return results
+
+
+if __name__ == "__main__":
+    from modeles.modele import load_model
+
+    ## Chemins à adapter
+    weights = "checkpoints/best.pt"     # poids entraînés
+    images_dir = Path("data/images")    # images à traiter
+
+    model = load_model(weights)
+    paths = sorted(str(p) for p in images_dir.iterdir() if p.is_file())
+    with PredictionCache() as cache:
+        predict_with_cache(model, weights, paths, cache)
+        stats = cache.stats()
+    print(f"[INFO] Cache : {stats['hits']} succès, {stats['misses']} échecs "
+          f"({stats['hit_rate']:.1%}), {stats['entries']} entrées, {stats['bytes'] / 1e6:.1f} Mo")
@@ -0,0 +1,138 @@
+# modeles/cascade.py
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from modeles.inference import predict_detections, predict_fire_scores
+
+
+# =================== Entraînement du classifieur ===================
+def train_classifier(data_dir: str = "data/dataset_cls", weights: str = "yolov8n-cls.pt",
+                     epochs: int = 20, imgsz: int = 224, device="cpu"):
+    """
+    Entraîne le petit classifieur feu / pas de feu de la cascade
+    (dossier produit par build_classification_dataset).
+    """
+    from modeles.modele import load_model
+
+    model = load_model(weights)
+    model.train(data=data_dir, epochs=epochs, imgsz=imgsz, device=device)
+    return model
+
+
+# =================== Calibration du seuil ===================
+def threshold_curve(scores: np.ndarray, positives: np.ndarray, weights: Optional[np.ndarray] = None,
+                    thresholds: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Pour chaque seuil : rappel conservé (part des positifs, pondérés par leur nombre de boîtes,
+    qui atteignent le détecteur) et taux de passage (part des tuiles envoyées au détecteur).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    positives = np.asarray(positives, dtype=bool)
+    weights = np.ones(len(scores)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if thresholds is None:
+        thresholds = np.linspace(0.0, 1.0, 101)
+
+    passed = scores[None, :] >= np.asarray(thresholds)[:, None]          # (T, N)
+    pos_weight = np.where(positives, weights, 0.0)
+    total = pos_weight.sum()
+    recall = (passed * pos_weight).sum(axis=1) / total if total else np.ones(len(thresholds))
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "recall": recall,
+        "recall_loss": 1 - recall,
+        "pass_rate": passed.mean(axis=1) if len(scores) else np.zeros(len(thresholds)),
+    })
+
+
+def calibrate_threshold(scores: np.ndarray, positives: np.ndarray, weights: Optional[np.ndarray] = None,
+                        max_recall_loss: float = 0.01) -> dict:
+    """
+    Choisit le seuil le plus haut (donc le plus rapide) dont la perte de rappel
+    reste inférieure ou égale à max_recall_loss.
+    """
+    curve = threshold_curve(scores, positives, weights)
+    ok = curve[curve["recall_loss"] <= max_recall_loss + 1e-12]
+    best = ok.iloc[-1] if len(ok) else curve.iloc[0]
+    return {
+        "threshold": float(best["threshold"]),
+        "recall_loss": float(best["recall_loss"]),
+        "pass_rate": float(best["pass_rate"]),
+        "expected_speedup": float(1 / best["pass_rate"]) if best["pass_rate"] > 0 else float("inf"),
+    }
+
+
+def calibrate_on_split(classifier, data_dir: str = "data/dataset_cls", split: str = "val",
+                       max_recall_loss: float = 0.01, imgsz: int = 224, batch: int = 64) -> dict:
+    """
+    Calibre le seuil sur un split du dataset de classification (manifest.csv) :
+    la perte de rappel est pondérée par le nombre de boîtes de chaque image positive.
+    """
+    manifest = pd.read_csv(Path(data_dir) / "manifest.csv")
+    manifest = manifest[manifest["split"] == split]
+    paths = [Path(data_dir) / rel for rel in manifest["path"]]
+
+    scores = []
+    for start in range(0, len(paths), batch):
+        images = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in paths[start:start + batch]]
+        scores.append(predict_fire_scores(classifier, images, imgsz=imgsz))
+    scores = np.concatenate(scores) if scores else np.zeros(0)
+
+    result = calibrate_threshold(scores, (manifest["label"] == "fire").to_numpy(),
+                                 manifest["n_boxes"].to_numpy(), max_recall_loss)
+    print(f"[INFO] Seuil calibré sur {split} : {result['threshold']:.2f} "
+          f"(perte de rappel {result['recall_loss']:.2%}, {result['pass_rate']:.1%} des tuiles "
+          f"vers le détecteur, accélération attendue ×{result['expected_speedup']:.1f})")
+    return result
+
+
+# =================== Inférence en cascade ===================
+def cascade_predict(classifier, detector, images: list, threshold: float = 0.1,
+                    cls_imgsz: int = 224, imgsz: int = 512, conf: float = 0.25,
+                    batch: int = 32) -> tuple[list[np.ndarray], dict]:
+    """
+    Cascade à deux étages : le classifieur note chaque tuile, seules celles dont le score
+    atteint threshold passent par le détecteur (les autres reçoivent zéro détection).
+    Returns :
+        tuple : détections (N, 6) par tuile, statistiques (taux de passage, débit)
+    """
+    start = time.perf_counter()
+    detections = [np.zeros((0, 6), dtype=np.float32)] * len(images)
+    passed = 0
+    for offset in range(0, len(images), batch):
+        chunk = images[offset:offset + batch]
+        scores = predict_fire_scores(classifier, chunk, imgsz=cls_imgsz)
+        keep = np.where(scores >= threshold)[0]
+        passed += len(keep)
+        for i, det in zip(keep, predict_detections(detector, [chunk[i] for i in keep], imgsz=imgsz, conf=conf)):
+            detections[offset + i] = det
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "tiles": len(images),
+        "passed": passed,
+        "pass_rate": passed / len(images) if images else 0.0,
+        "seconds": seconds,
+        "throughput_ips": len(images) / seconds if seconds > 0 else 0.0,
+    }
+    return detections, stats
+
+
+if __name__ == "__main__":
+    from modeles.modele import load_model
+
+    ## Chemins à adapter
+    classifier = load_model("runs/classify/train/weights/best.pt")   # classifieur feu / pas de feu
+    detector = load_model("checkpoints/best.pt")                     # détecteur
+    tiles = sorted(Path("data/tiles").glob("*.jpg"))
+
+    calibration = calibrate_on_split(classifier, max_recall_loss=0.01)
+    images = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in tiles]
+    _, stats = cascade_predict(classifier, detector, images, threshold=calibration["threshold"])
+    print(f"[INFO] Cascade : {stats['passed']}/{stats['tiles']} tuiles détectées "
+          f"({stats['throughput_ips']:.1f} tuiles/s)")
@@ -0,0 +1,279 @@
+# modeles/evaluate.py
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+RECALL_POINTS = np.linspace(0.0, 1.0, 101)
+
+
+# =================== Prédictions JSONL ===================
+def save_predictions_jsonl(predictions: list[dict], output_path: str):
+    """
+    Sauvegarde des prédictions au format JSONL (une détection par ligne) :
+    {"image_id", "category_id", "bbox": [x, y, w, h], "score"}.
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        for pred in predictions:
+            f.write(json.dumps(pred, default=float) + "\n")
+    print(f"[INFO] {len(predictions)} prédictions sauvegardées → {output_path}")
+
+
+def load_predictions_jsonl(file_path: str, images_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Charge des prédictions JSONL. Les lignes peuvent référencer l'image par "image_id"
+    ou par "file_name" (converti en image_id grâce à images_df).
+    """
+    file = Path(file_path)
+    if not file.exists():
+        raise FileNotFoundError(f"Le fichier {file_path} est introuvable.")
+
+    preds = pd.read_json(file, lines=True)
+    if preds.empty:
+        return pd.DataFrame(columns=["image_id", "category_id", "bbox", "score"])
+    if "image_id" not in preds.columns:
+        if images_df is None or "file_name" not in preds.columns:
+            raise ValueError("Les prédictions doivent contenir 'image_id' (ou 'file_name' avec images_df)")
+        ids = dict(zip(images_df["file_name"], images_df["id"]))
+        preds["image_id"] = preds["file_name"].map(ids)
+        preds = preds.dropna(subset=["image_id"])
+        preds["image_id"] = preds["image_id"].astype(images_df["id"].dtype)
+    return preds
+
+
+def predict_to_records(model, images_df: pd.DataFrame, category_ids: Sequence[int],
+                       imgsz: int = 512, conf: float = 0.001, batch: int = 16) -> list[dict]:
+    """
+    Lance le modèle sur les images (colonne file_path) et renvoie des prédictions au format JSONL.
+    category_ids[i] est la catégorie COCO de la classe YOLO i (même ordre que coco_to_yolo).
+    """
+    import cv2
+    from modeles.inference import predict_detections
+
+    records = []
+    rows = images_df[["id", "file_path"]].to_numpy()
+    for start in range(0, len(rows), batch):
+        chunk = rows[start:start + batch]
+        images = [cv2.imread(str(path), cv2.IMREAD_COLOR) for _, path in chunk]
+        for (image_id, _), det in zip(chunk, predict_detections(model, images, imgsz=imgsz, conf=conf)):
+            for x1, y1, x2, y2, score, cls in det.tolist():
+                records.append({
+                    "image_id": int(image_id),
+                    "category_id": int(category_ids[int(cls)]),
+                    "bbox": [x1, y1, x2 - x1, y2 - y1],
+                    "score": score,
+                })
+    return records
+
+
+# =================== IoU vectorisée ===================
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Matrice d'IoU (N, M) entre deux ensembles de boîtes COCO [x, y, w, h]."""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    ax2, ay2 = a[:, 0] + a[:, 2], a[:, 1] + a[:, 3]
+    bx2, by2 = b[:, 0] + b[:, 2], b[:, 1] + b[:, 3]
+    iw = np.clip(np.minimum(ax2[:, None], bx2[None]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(ay2[:, None], by2[None]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-12), 0.0)
+
+
+# =================== Appariement par image ===================
+def _match_image(args) -> tuple:
+    """
+    Apparie les prédictions d'une image à la vérité terrain, classe par classe,
+    pour tous les seuils d'IoU à la fois, et remplit la matrice de confusion de l'image.
+    """
+    gt_boxes, gt_cls, pred_boxes, pred_scores, pred_cls, iou_thresholds, max_dets, n_classes = args
+    n_thr = len(iou_thresholds)
+    keep = np.zeros(len(pred_scores), dtype=bool)
+    tp = np.zeros((n_thr, len(pred_scores)), dtype=bool)
+
+    # --- Appariement glouton COCO (par score décroissant) ---
+    for c in np.unique(np.concatenate([gt_cls, pred_cls])):
+        p_idx = np.where(pred_cls == c)[0]
+        p_idx = p_idx[np.argsort(-pred_scores[p_idx], kind="mergesort")][:max_dets]
+        keep[p_idx] = True
+        g_idx = np.where(gt_cls == c)[0]
+        if len(p_idx) == 0 or len(g_idx) == 0:
+            continue
+        iou = box_iou(pred_boxes[p_idx], gt_boxes[g_idx])
+        taken = np.zeros((n_thr, len(g_idx)), dtype=bool)
+        for i, p in enumerate(p_idx):
+            cand = np.where(taken, -1.0, iou[i][None, :])
+            best = cand.argmax(axis=1)
+            ok = cand[np.arange(n_thr), best] >= iou_thresholds
+            tp[ok, p] = True
+            taken[np.where(ok)[0], best[ok]] = True
+
+    # --- Matrice de confusion (IoU 0.5, toutes classes confondues) ---
+    confusion = np.zeros((n_classes + 1, n_classes + 1), dtype=np.int64)
+    iou = box_iou(pred_boxes, gt_boxes)
+    pairs = np.argwhere(iou >= 0.5)
+    matched_p, matched_g = set(), set()
+    if len(pairs):
+        pairs = pairs[np.argsort(-iou[pairs[:, 0], pairs[:, 1]], kind="mergesort")]
+        for p, g in pairs:
+            if p in matched_p or g in matched_g:
+                continue
+            matched_p.add(p)
+            matched_g.add(g)
+            confusion[pred_cls[p], gt_cls[g]] += 1
+    for g in range(len(gt_cls)):
+        if g not in matched_g:
+            confusion[n_classes, gt_cls[g]] += 1
+    for p in range(len(pred_cls)):
+        if p not in matched_p:
+            confusion[pred_cls[p], n_classes] += 1
+
+    return pred_scores[keep], pred_cls[keep], tp[:, keep], confusion
+
+
+# =================== Accumulation par classe ===================
+def _average_precision(scores: np.ndarray, tp: np.ndarray, n_gt: int) -> tuple:
+    """
+    AP interpolée sur 101 points de rappel (convention COCO) pour chaque seuil d'IoU.
+    Returns :
+        tuple : AP par seuil (T,), précision interpolée (T, 101)
+    """
+    n_thr = tp.shape[0]
+    if n_gt == 0:
+        return np.full(n_thr, np.nan), np.full((n_thr, len(RECALL_POINTS)), np.nan)
+    if len(scores) == 0:
+        return np.zeros(n_thr), np.zeros((n_thr, len(RECALL_POINTS)))
+
+    order = np.argsort(-scores, kind="mergesort")
+    tpc = np.cumsum(tp[:, order], axis=1)
+    fpc = np.cumsum(~tp[:, order], axis=1)
+    recall = tpc / n_gt
+    precision = tpc / (tpc + fpc)
+    # Enveloppe décroissante de la précision
+    precision = np.maximum.accumulate(precision[:, ::-1], axis=1)[:, ::-1]
+
+    curves = np.zeros((n_thr, len(RECALL_POINTS)))
+    for t in range(n_thr):
+        idx = np.searchsorted(recall[t], RECALL_POINTS, side="left")
+        valid = idx < len(order)
+        curves[t, valid] = precision[t, idx[valid]]
+    return curves.mean(axis=1), curves
+
+
+def evaluate_predictions(images_df: pd.DataFrame, annotations_df: pd.DataFrame,
+                         categories_df: pd.DataFrame, predictions_df: pd.DataFrame,
+                         conf: float = 0.0, iou_thresholds: Sequence[float] = IOU_THRESHOLDS,
+                         max_dets: int = 100, workers: Optional[int] = None) -> dict:
+    """
+    Évalue des prédictions sauvegardées contre la vérité terrain COCO, sans relancer le modèle.
+    Args :
+        images_df, annotations_df, categories_df : DataFrames COCO (coco_to_dataframes)
+        predictions_df (pd.DataFrame) : prédictions (load_predictions_jsonl)
+        conf (float) : seuil de confiance appliqué avant l'évaluation
+        iou_thresholds (Sequence[float]) : seuils d'IoU (par défaut 0.5:0.95)
+        max_dets (int) : nombre maximal de détections par image et par classe
+        workers (int) : nombre de processus (par défaut os.cpu_count())
+    Returns :
+        dict : map50_95, map50, per_class (DataFrame), pr_curves, confusion_matrix
+    """
+    iou_thresholds = np.asarray(iou_thresholds, dtype=np.float64)
+    cat_ids = categories_df["id"].tolist()
+    cat_index = {c: i for i, c in enumerate(cat_ids)}
+    n_classes = len(cat_ids)
+
+    preds = predictions_df[predictions_df["score"] >= conf] if len(predictions_df) else predictions_df
+    preds = preds[preds["category_id"].isin(cat_index)] if len(preds) else preds
+
+    def stack(df):
+        if len(df) == 0:
+            return {}, np.zeros((0, 4)), np.zeros(0, dtype=np.int64)
+        boxes = np.array(df["bbox"].tolist(), dtype=np.float64).reshape(-1, 4)
+        cls = df["category_id"].map(cat_index).to_numpy(dtype=np.int64)
+        groups = df.groupby("image_id").indices
+        return groups, boxes, cls
+
+    gt_groups, gt_boxes, gt_cls = stack(annotations_df[annotations_df["category_id"].isin(cat_index)]
+                                        if len(annotations_df) else annotations_df)
+    pr_groups, pr_boxes, pr_cls = stack(preds)
+    pr_scores = preds["score"].to_numpy(dtype=np.float64) if len(preds) else np.zeros(0)
+
+    empty = np.zeros(0, dtype=np.int64)
+    tasks = []
+    for image_id in images_df["id"]:
+        g = gt_groups.get(image_id, empty)
+        p = pr_groups.get(image_id, empty)
+        tasks.append((gt_boxes[g], gt_cls[g], pr_boxes[p], pr_scores[p], pr_cls[p],
+                      iou_thresholds, max_dets, n_classes))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_match_image, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [_match_image(t) for t in tasks]
+
+    scores = np.concatenate([r[0] for r in results]) if results else np.zeros(0)
+    classes = np.concatenate([r[1] for r in results]) if results else empty
+    tp = np.concatenate([r[2] for r in results], axis=1) if results else np.zeros((len(iou_thresholds), 0), bool)
+    confusion = sum((r[3] for r in results), np.zeros((n_classes + 1, n_classes + 1), dtype=np.int64))
+    n_gt = np.bincount(gt_cls, minlength=n_classes)
+
+    # --- Métriques par classe ---
+    rows, pr_curves = [], {}
+    i50 = int(np.argmin(np.abs(iou_thresholds - 0.5)))
+    names = categories_df["name"].tolist() if "name" in categories_df.columns else cat_ids
+    for i, cat_id in enumerate(cat_ids):
+        mask = classes == i
+        ap, curves = _average_precision(scores[mask], tp[:, mask], int(n_gt[i]))
+        pr_curves[cat_id] = (RECALL_POINTS, curves[i50])
+        n_tp = int(tp[i50, mask].sum())
+        rows.append({
+            "category_id": cat_id,
+            "name": names[i],
+            "n_gt": int(n_gt[i]),
+            "n_pred": int(mask.sum()),
+            "precision": n_tp / mask.sum() if mask.sum() else 0.0,
+            "recall": n_tp / n_gt[i] if n_gt[i] else np.nan,
+            "ap50": ap[i50],
+            "ap50_95": np.nanmean(ap) if not np.isnan(ap).all() else np.nan,
+        })
+    per_class = pd.DataFrame(rows)
+
+    return {
+        "map50": float(per_class["ap50"].mean()) if per_class["ap50"].notna().any() else float("nan"),
+        "map50_95": float(per_class["ap50_95"].mean()) if per_class["ap50_95"].notna().any() else float("nan"),
+        "per_class": per_class,
+        "pr_curves": pr_curves,
+        "confusion_matrix": confusion,
+    }
+
+
+def evaluate_files(coco_json_path: str, predictions_path: str, conf: float = 0.0, **kwargs) -> dict:
+    """Évalue un fichier JSONL de prédictions contre un COCO nettoyé (annotations_clean.json)."""
+    dfs = coco_to_dataframes(load_coco_annotations(coco_json_path))
+    preds = load_predictions_jsonl(predictions_path, dfs["images"])
+    metrics = evaluate_predictions(dfs["images"], dfs["annotations"], dfs["categories"], preds,
+                                   conf=conf, **kwargs)
+
+    print(f"[INFO] Évaluation (conf >= {conf}) :")
+    print(f"  - mAP50 : {metrics['map50']:.4f}")
+    print(f"  - mAP50-95 : {metrics['map50_95']:.4f}")
+    print(metrics["per_class"].to_string(index=False))
+    return metrics
+
+
+if __name__ == "__main__":
+    ## Fichiers à adapter
+    coco_json_path = "data/annotations_clean.json"   # vérité terrain nettoyée
+    predictions_path = "data/predictions.jsonl"      # prédictions sauvegardées
+
+    for conf in (0.001, 0.25, 0.5):
+        evaluate_files(coco_json_path, predictions_path, conf=conf)
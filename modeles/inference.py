@@ -0,0 +1,78 @@
+# modeles/inference.py
+
+import os
+
+import numpy as np
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def set_threads(threads: int):
+    """Fixe le nombre de threads intra-op (variables d'environnement + PyTorch si présent)."""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def results_to_detections(results) -> list[np.ndarray]:
+    """
+    Convertit les résultats Ultralytics en tableaux numpy.
+    Args :
+        results : liste d'objets Results renvoyés par model.predict
+    Returns :
+        list[np.ndarray] : un tableau (N, 6) par image : x1, y1, x2, y2, conf, classe
+    """
+    detections = []
+    for r in results:
+        boxes = r.boxes
+        if boxes is None or len(boxes) == 0:
+            detections.append(np.zeros((0, 6), dtype=np.float32))
+            continue
+        det = np.concatenate([
+            boxes.xyxy.cpu().numpy(),
+            boxes.conf.cpu().numpy()[:, None],
+            boxes.cls.cpu().numpy()[:, None],
+        ], axis=1)
+        detections.append(det.astype(np.float32))
+    return detections
+
+
+def predict_detections(model, images: list, imgsz: int = 512, conf: float = 0.25, **kwargs) -> list[np.ndarray]:
+    """
+    Lance le détecteur sur une liste d'images (tableaux BGR, convention OpenCV).
+    Args :
+        model : modèle renvoyé par load_model
+        images (list) : images à traiter
+        imgsz (int) : taille d'entrée du modèle
+        conf (float) : seuil de confiance
+    Returns :
+        list[np.ndarray] : détections (N, 6) par image
+    """
+    if len(images) == 0:
+        return []
+    results = model.predict(images, imgsz=imgsz, conf=conf, verbose=False, **kwargs)
+    return results_to_detections(results)
+
+
+def predict_fire_scores(classifier, images: list, imgsz: int = 224, positive: str = "fire") -> np.ndarray:
+    """
+    Lance un classifieur Ultralytics (tâche classify) et renvoie la probabilité de la classe positive.
+    Args :
+        classifier : modèle de classification renvoyé par load_model
+        images (list) : images BGR
+        positive (str) : nom de la classe "feu" dans classifier.names
+    Returns :
+        np.ndarray : score (N,) par image
+    """
+    if len(images) == 0:
+        return np.zeros(0, dtype=np.float32)
+    names = classifier.names
+    index = next((i for i, name in names.items() if name == positive), None)
+    if index is None:
+        raise ValueError(f"La classe '{positive}' est absente du classifieur : {list(names.values())}")
+    results = classifier.predict(images, imgsz=imgsz, verbose=False)
+    return np.array([float(r.probs.data[index]) for r in results], dtype=np.float32)
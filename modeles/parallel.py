@@ -0,0 +1,258 @@
+# modeles/parallel.py
+
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from modeles.inference import predict_detections, set_threads
+
+READY = -1  # message d'un processus prêt (modèle chargé), les autres messages sont des emplacements
+
+
+def _load_model(weights: str):
+    """Chargeur par défaut (fonction de module : doit pouvoir être transmise aux processus)."""
+    from modeles.modele import load_model
+    return load_model(weights)
+
+
+def available_cpus() -> list[int]:
+    """Cœurs utilisables par ce processus (restrictions cgroup / taskset comprises)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+# =================== Tampons en mémoire partagée ===================
+def _ring_layout(slots: int, batch: int, max_side: int, max_dets: int) -> dict:
+    """Formes et types des tableaux partagés de l'anneau."""
+    return {
+        "images": ((slots, batch, max_side, max_side, 3), np.uint8),
+        "meta": ((slots, batch, 3), np.float64),           # hauteur, largeur, échelle
+        "boxes": ((slots, batch, max_dets, 6), np.float32),
+        "counts": ((slots, batch), np.int32),
+    }
+
+
+def _create_ring(layout: dict) -> tuple[dict, dict]:
+    """Crée les segments de mémoire partagée ; renvoie (segments, tableaux numpy)."""
+    shms, arrays = {}, {}
+    for name, (shape, dtype) in layout.items():
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shms[name] = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shms[name].buf)
+    return shms, arrays
+
+
+def _attach_ring(names: dict, layout: dict) -> tuple[dict, dict]:
+    """Ouvre dans un processus fils les segments créés par le parent."""
+    shms, arrays = {}, {}
+    for name, (shape, dtype) in layout.items():
+        shms[name] = shared_memory.SharedMemory(name=names[name])
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shms[name].buf)
+    return shms, arrays
+
+
+# =================== Processus de calcul ===================
+def _worker_main(weights: str, loader: Callable, threads: int, cores: Optional[list],
+                 names: dict, layout: dict, tasks, done, imgsz: int, conf: float):
+    """
+    Boucle d'un processus : modèle chargé une seule fois, nombre de threads fixé,
+    lecture des lots et écriture des détections directement en mémoire partagée.
+    """
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    set_threads(threads)
+
+    model = loader(weights)
+    shms, arrays = _attach_ring(names, layout)
+    max_dets = layout["boxes"][0][2]
+    done.put(READY)
+    try:
+        while True:
+            message = tasks.get()
+            if message is None:
+                break
+            slot, n = message
+            meta = arrays["meta"][slot]
+            valid = [i for i in range(n) if meta[i, 0] > 0]   # images illisibles : zéro détection
+            images = [arrays["images"][slot, i, :int(meta[i, 0]), :int(meta[i, 1])] for i in valid]
+            for i, det in zip(valid, predict_detections(model, images, imgsz=imgsz, conf=conf)):
+                k = min(len(det), max_dets)
+                arrays["boxes"][slot, i, :k] = det[:k]
+                arrays["counts"][slot, i] = k
+            done.put(slot)
+    finally:
+        del arrays
+        for shm in shms.values():
+            shm.close()
+
+
+# =================== Côté parent ===================
+def _fill_slot(arrays: dict, slot: int, paths: Sequence[str], max_side: int):
+    """Décode un lot d'images directement dans un emplacement de l'anneau (OpenCV libère le GIL)."""
+    arrays["counts"][slot, :len(paths)] = 0
+    for i, path in enumerate(paths):
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if img is None:
+            arrays["meta"][slot, i] = (0, 0, 1.0)
+            continue
+        h, w = img.shape[:2]
+        scale = min(1.0, max_side / max(h, w))
+        if scale < 1.0:
+            img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+            h, w = img.shape[:2]
+        arrays["images"][slot, i, :h, :w] = img
+        arrays["meta"][slot, i] = (h, w, scale)
+
+
+def iter_parallel_predictions(weights: str, image_paths: Sequence[str], workers: Optional[int] = None,
+                              threads_per_worker: int = 1, batch: int = 8, slots: Optional[int] = None,
+                              decoders: Optional[int] = None, imgsz: int = 512, conf: float = 0.25,
+                              max_dets: int = 300, pin_cores: bool = True, loader: Callable = _load_model,
+                              timings: Optional[dict] = None):
+    """
+    Inférence multi-processus : chaque processus charge le modèle une fois (threads fixés),
+    les images décodées et les détections transitent par un anneau de tampons en mémoire
+    partagée ; seuls des indices d'emplacement passent par les files.
+
+    Le décodage se fait dans un pool de decoders threads (par défaut un par processus) :
+    chaque emplacement libre est rempli en tâche de fond puis confié aux processus dès qu'il
+    est prêt, sans bloquer la collecte ordonnée des résultats.
+
+    Les images sont réduites côté parent à imgsz (plus grand côté), ce que le modèle ferait
+    de toute façon, et les boîtes sont remises à l'échelle d'origine.
+
+    Args :
+        timings (dict) : si fourni, reçoit "startup_seconds" (temps de chargement des modèles)
+
+    Yields :
+        tuple : (chemin, détections (N, 6)) dans l'ordre de image_paths
+    """
+    start = time.perf_counter()
+    cpus = available_cpus()
+    workers = workers or max(1, len(cpus) // threads_per_worker)
+    slots = slots or 2 * workers
+    batches = [image_paths[i:i + batch] for i in range(0, len(image_paths), batch)]
+    layout = _ring_layout(slots, batch, imgsz, max_dets)
+    shms, arrays = _create_ring(layout)
+    names = {name: shm.name for name, shm in shms.items()}
+
+    ctx = multiprocessing.get_context("spawn")
+    tasks, done = ctx.Queue(), ctx.Queue()
+    processes = []
+    for w in range(workers):
+        cores = [cpus[(w * threads_per_worker + t) % len(cpus)] for t in range(threads_per_worker)] if pin_cores else None
+        p = ctx.Process(target=_worker_main, daemon=True,
+                        args=(weights, loader, threads_per_worker, cores, names, layout, tasks, done, imgsz, conf))
+        p.start()
+        processes.append(p)
+
+    decoder = ThreadPoolExecutor(max_workers=decoders or workers)
+    errors = []
+
+    def submit(slot: int, seq: int):
+        """Remplit l'emplacement en tâche de fond puis le confie aux processus."""
+        def dispatch(future):
+            if future.exception() is not None:
+                errors.append(future.exception())
+            else:
+                tasks.put((slot, len(batches[seq])))
+        decoder.submit(_fill_slot, arrays, slot, batches[seq], imgsz).add_done_callback(dispatch)
+
+    free, slot_seq, finished = deque(range(slots)), {}, set()
+    next_submit, next_yield, ready = 0, 0, 0
+    try:
+        while next_yield < len(batches):
+            # Remplir à l'avance tous les emplacements libres (non bloquant)
+            while free and next_submit < len(batches):
+                slot = free.popleft()
+                slot_seq[slot] = next_submit
+                submit(slot, next_submit)
+                next_submit += 1
+
+            # Attendre le prochain lot dans l'ordre
+            slot = next(s for s, seq in slot_seq.items() if seq == next_yield)
+            while slot not in finished:
+                if errors:
+                    raise errors[0]
+                try:
+                    message = done.get(timeout=1.0)
+                except queue.Empty:
+                    if not all(p.is_alive() for p in processes):
+                        raise RuntimeError("Un processus d'inférence s'est arrêté prématurément.")
+                    continue
+                if message == READY:
+                    ready += 1
+                    if ready == workers and timings is not None:
+                        timings["startup_seconds"] = time.perf_counter() - start
+                else:
+                    finished.add(message)
+
+            for i, path in enumerate(batches[next_yield]):
+                k = arrays["counts"][slot, i]
+                det = arrays["boxes"][slot, i, :k].copy()
+                det[:, :4] /= arrays["meta"][slot, i, 2]
+                yield path, det
+
+            finished.discard(slot)
+            del slot_seq[slot]
+            free.append(slot)
+            next_yield += 1
+    finally:
+        decoder.shutdown(wait=True, cancel_futures=True)
+        for _ in processes:
+            tasks.put(None)
+        for p in processes:
+            p.join(timeout=10)
+            if p.is_alive():
+                p.terminate()
+        del arrays
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+
+
+def run_parallel_inference(weights: str, image_paths: Sequence[str], **kwargs) -> tuple[list[np.ndarray], dict]:
+    """
+    Lance iter_parallel_predictions sur toutes les images et affiche le débit.
+    Le débit "steady_ips" exclut le chargement des modèles dans les processus
+    (compté une fois tous les processus prêts).
+    Returns :
+        tuple : détections (N, 6) par image (même ordre que image_paths), statistiques
+    """
+    timings, detections = {}, []
+    start = end = time.perf_counter()
+    for _, det in iter_parallel_predictions(weights, image_paths, timings=timings, **kwargs):
+        detections.append(det)
+        end = time.perf_counter()   # arrêt des processus non compté
+    seconds = end - start
+    startup = min(timings.get("startup_seconds", 0.0), seconds)
+    stats = {
+        "images": len(image_paths),
+        "seconds": seconds,
+        "startup_seconds": startup,
+        "throughput_ips": len(image_paths) / seconds if seconds > 0 else 0.0,
+        "steady_ips": len(image_paths) / (seconds - startup) if seconds > startup else 0.0,
+    }
+    print(f"[INFO] Inférence parallèle : {stats['images']} images en {seconds:.1f} s "
+          f"({stats['throughput_ips']:.1f} images/s, {stats['steady_ips']:.1f} images/s hors chargement "
+          f"des modèles en {startup:.1f} s)")
+    return detections, stats
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    ## Chemins à adapter
+    weights = "checkpoints/best.pt"
+    paths = sorted(str(p) for p in Path("data/images").glob("*.jpg"))
+
+    run_parallel_inference(weights, paths, threads_per_worker=1, batch=8)
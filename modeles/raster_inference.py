@@ -0,0 +1,96 @@
+# modeles/raster_inference.py
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from modeles.inference import predict_detections
+from prepare_data.raster_reader import WindowedTiffReader, boxes_to_geo, iter_windows
+
+
+def _core_bounds(starts: Sequence[int], size: int, length: int) -> dict:
+    """
+    Cœur de chaque fenêtre le long d'un axe : la frontière avec la voisine est placée au milieu
+    de leur recouvrement réel (la dernière fenêtre, recalée sur le bord, recouvre davantage).
+    """
+    starts = sorted(set(starts))
+    ends = [min(s + size, length) for s in starts]
+    bounds = {}
+    for i, s in enumerate(starts):
+        lo = (ends[i - 1] + s) / 2 if i > 0 else 0
+        hi = (ends[i] + starts[i + 1]) / 2 if i + 1 < len(starts) else length
+        bounds[s] = (lo, hi)
+    return bounds
+
+
+def _keep_core(det: np.ndarray, x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+    """
+    Garde les détections dont le centre tombe dans le cœur [x1, x2[ × [y1, y2[ de la fenêtre
+    pour éviter les doublons entre fenêtres voisines.
+    """
+    cx = (det[:, 0] + det[:, 2]) / 2
+    cy = (det[:, 1] + det[:, 3]) / 2
+    return det[(cx >= x1) & (cx < x2) & (cy >= y1) & (cy < y2)]
+
+
+def detect_raster(model, path: str, size: int = 1024, overlap: int = 128,
+                  bands: Sequence[int] = (0, 1, 2), band_range: Optional[np.ndarray] = None,
+                  batch: int = 4, imgsz: int = 1024, conf: float = 0.25) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Détecte les incendies sur une scène GeoTIFF de taille quelconque, fenêtre par fenêtre.
+    Args :
+        model : modèle renvoyé par load_model
+        path (str) : chemin du GeoTIFF
+        size (int) : taille des fenêtres lues
+        overlap (int) : recouvrement entre fenêtres voisines
+        bands (Sequence[int]) : bandes utilisées comme R, G, B
+        band_range (np.ndarray) : bornes de normalisation (estimées sur la scène si None)
+        batch (int) : nombre de fenêtres envoyées ensemble au modèle
+    Returns :
+        tuple : détections pixel (N, 6) dans la scène, boîtes géographiques (N, 4)
+    """
+    kept = []
+    with WindowedTiffReader(path, bands, band_range) as reader:
+        if band_range is None and reader.dtype != np.uint8:
+            reader.band_range = reader.estimate_band_range()
+
+        windows = list(iter_windows(reader.width, reader.height, size, overlap))
+        x_cores = _core_bounds([x for x, _, _, _ in windows], size, reader.width)
+        y_cores = _core_bounds([y for _, y, _, _ in windows], size, reader.height)
+        pending = []
+
+        def flush():
+            images = [np.ascontiguousarray(rgb[..., ::-1]) for _, _, rgb in pending]  # RGB => BGR
+            for (x, y, rgb), det in zip(pending, predict_detections(model, images, imgsz=imgsz, conf=conf)):
+                det = det.copy()
+                det[:, [0, 2]] += x
+                det[:, [1, 3]] += y
+                (x1, x2), (y1, y2) = x_cores[x], y_cores[y]
+                kept.append(_keep_core(det, x1, y1, x2, y2))
+            pending.clear()
+
+        for window in reader.iter_rgb_windows(size, overlap):
+            pending.append(window)
+            if len(pending) >= batch:
+                flush()
+        if pending:
+            flush()
+
+        detections = np.concatenate(kept) if kept else np.zeros((0, 6), dtype=np.float32)
+        geo_boxes = boxes_to_geo(detections[:, :4], reader.geotransform)
+
+    print(f"[INFO] {len(detections)} détections sur {path}")
+    return detections, geo_boxes
+
+
+if __name__ == "__main__":
+    from modeles.modele import load_model
+
+    ## Chemins à adapter
+    weights = "checkpoints/best.pt"     # poids entraînés
+    scene = "data/raw/scene.tif"        # scène GeoTIFF
+
+    model = load_model(weights)
+    detections, geo_boxes = detect_raster(model, scene)
+    for det, geo in zip(detections, geo_boxes):
+        print(f"  - classe {int(det[5])} conf {det[4]:.2f} : {geo.round(2).tolist()}")
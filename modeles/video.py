@@ -0,0 +1,193 @@
+# modeles/video.py
+
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+from modeles.inference import predict_detections
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
+
+
+# =================== Lecture des images ===================
+def iter_frames(source: Union[str, int]):
+    """
+    Lit les images une par une, sans tout charger en mémoire.
+    Accepte une vidéo / un flux (OpenCV) ou un dossier d'images time-lapse (ordre alphabétique).
+    """
+    path = Path(str(source))
+    if path.is_dir():
+        for file in sorted(f for f in path.iterdir() if f.suffix.lower() in IMAGE_EXTENSIONS):
+            frame = cv2.imread(str(file), cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield frame
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"La source vidéo {source} est introuvable.")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+
+# =================== Score de différence ===================
+def downsample(frame: np.ndarray, size: int = 64) -> np.ndarray:
+    """Réduit une image en niveaux de gris (size x size) pour un calcul de différence peu coûteux."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def difference_score(reference: np.ndarray, small: np.ndarray) -> float:
+    """Différence absolue moyenne entre deux images réduites, normalisée dans [0, 1]."""
+    return float(np.mean(np.abs(small - reference))) / 255.0
+
+
+def changed_region(reference: np.ndarray, small: np.ndarray, grid: int = 8,
+                   threshold: float = 0.05) -> tuple[float, Optional[tuple]]:
+    """
+    Découpe la différence en grid x grid cellules et repère celles qui ont changé.
+    Returns :
+        tuple : fraction de cellules modifiées, boîte relative (x1, y1, x2, y2) dans [0, 1]
+                englobant ces cellules (None si rien n'a changé)
+    """
+    diff = np.abs(small - reference) / 255.0
+    h, w = diff.shape
+    ch, cw = h // grid, w // grid
+    cells = diff[:ch * grid, :cw * grid].reshape(grid, ch, grid, cw).mean(axis=(1, 3))
+    mask = cells > threshold
+    if not mask.any():
+        return 0.0, None
+
+    rows = np.where(mask.any(axis=1))[0]
+    cols = np.where(mask.any(axis=0))[0]
+    box = (cols[0] / grid, rows[0] / grid, (cols[-1] + 1) / grid, (rows[-1] + 1) / grid)
+    return float(mask.mean()), box
+
+
+# =================== Inférence avec porte de différence ===================
+def iter_video_detections(model, source: Union[str, int], threshold: float = 0.05, grid: int = 8,
+                          full_fraction: float = 0.5, margin: float = 0.05,
+                          keyframe_interval: int = 100, diff_size: int = 64,
+                          imgsz: int = 512, conf: float = 0.25):
+    """
+    Détecte les incendies image par image en ne lançant le modèle que sur ce qui a changé.
+
+    Chaque image est comparée (en basse résolution) à l'état de la dernière détection :
+    - aucune cellule modifiée => les détections précédentes sont réutilisées ("reused")
+    - peu de cellules modifiées => le modèle tourne sur la zone modifiée uniquement ("region")
+    - sinon, ou toutes les keyframe_interval images => détection complète ("full")
+
+    Yields :
+        dict : frame, mode, score, detections (N, 6), latency_ms
+    """
+    reference = None
+    detections = None
+    since_full = 0
+
+    for idx, frame in enumerate(iter_frames(source)):
+        start = time.perf_counter()
+        small = downsample(frame, diff_size)
+        score = 0.0 if reference is None else difference_score(reference, small)
+
+        if detections is None or since_full >= keyframe_interval:
+            mode, box = "full", None
+        else:
+            fraction, box = changed_region(reference, small, grid, threshold)
+            if box is None:
+                mode = "reused"
+            elif fraction >= full_fraction:
+                mode = "full"
+            else:
+                mode = "region"
+
+        if mode == "full":
+            detections = predict_detections(model, [frame], imgsz=imgsz, conf=conf)[0]
+            reference = small
+            since_full = 0
+        elif mode == "region":
+            h, w = frame.shape[:2]
+            x1 = int(max(0.0, box[0] - margin) * w)
+            y1 = int(max(0.0, box[1] - margin) * h)
+            x2 = int(min(1.0, box[2] + margin) * w)
+            y2 = int(min(1.0, box[3] + margin) * h)
+            new = predict_detections(model, [frame[y1:y2, x1:x2]], imgsz=imgsz, conf=conf)[0].copy()
+            new[:, [0, 2]] += x1
+            new[:, [1, 3]] += y1
+
+            # Garder les anciennes détections dont le centre est hors de la zone recalculée
+            cx = (detections[:, 0] + detections[:, 2]) / 2
+            cy = (detections[:, 1] + detections[:, 3]) / 2
+            outside = (cx < x1) | (cx >= x2) | (cy < y1) | (cy >= y2)
+            detections = np.concatenate([detections[outside], new], axis=0)
+
+            # Mettre à jour la référence uniquement sur la zone recalculée
+            reference = reference.copy()
+            sy1, sy2 = int(y1 / h * diff_size), int(np.ceil(y2 / h * diff_size))
+            sx1, sx2 = int(x1 / w * diff_size), int(np.ceil(x2 / w * diff_size))
+            reference[sy1:sy2, sx1:sx2] = small[sy1:sy2, sx1:sx2]
+            since_full += 1
+        else:
+            since_full += 1
+
+        yield {
+            "frame": idx,
+            "mode": mode,
+            "score": score,
+            "detections": detections,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+        }
+
+
+def summarize_video_run(records: list[dict]) -> dict:
+    """Calcule le taux d'images sautées et les latences d'un passage vidéo."""
+    n = len(records)
+    modes = [r["mode"] for r in records]
+    latencies = np.array([r["latency_ms"] for r in records]) if n else np.zeros(1)
+    return {
+        "frames": n,
+        "full": modes.count("full"),
+        "region": modes.count("region"),
+        "reused": modes.count("reused"),
+        "skip_rate": modes.count("reused") / n if n else 0.0,
+        "latency_ms_mean": float(latencies.mean()),
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+    }
+
+
+def detect_video(model, source: Union[str, int], **kwargs) -> tuple[list[dict], dict]:
+    """
+    Lance iter_video_detections sur toute la source et affiche le résumé.
+    Returns :
+        tuple : liste des enregistrements par image, statistiques (summarize_video_run)
+    """
+    records = list(iter_video_detections(model, source, **kwargs))
+    stats = summarize_video_run(records)
+
+    print("[INFO] Inférence vidéo terminée :")
+    print(f"  - images : {stats['frames']} (complètes : {stats['full']}, "
+          f"zones : {stats['region']}, réutilisées : {stats['reused']})")
+    print(f"  - taux d'images sautées : {stats['skip_rate']:.1%}")
+    print(f"  - latence moyenne / p50 / p95 : {stats['latency_ms_mean']:.1f} / "
+          f"{stats['latency_ms_p50']:.1f} / {stats['latency_ms_p95']:.1f} ms")
+    return records, stats
+
+
+if __name__ == "__main__":
+    from modeles.modele import load_model
+
+    ## Chemins à adapter
+    weights = "checkpoints/best.pt"      # poids entraînés
+    source = "data/timelapse"            # vidéo, flux ou dossier d'images
+
+    model = load_model(weights)
+    detect_video(model, source)
@@ -0,0 +1,87 @@
+# prepare_data/classification_dataset.py
+
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes
+from prepare_data.data_cleaner import images_without_annotations
+
+POSITIVE, NEGATIVE = "fire", "no_fire"
+
+
+def build_classification_dataset(coco_json_path: str, images_dir: str, output_dir: str,
+                                 val_size: float = 0.2, seed: int = 42) -> pd.DataFrame:
+    """
+    Construit un dataset de classification feu / pas de feu pour le classifieur de la cascade.
+    Les négatifs sont les images sans annotation (images_without_annotations) : il faut donc
+    partir du COCO brut ou d'un COCO qui les contient encore (clean_dataset les supprime).
+
+    Structure produite (format classify d'Ultralytics) :
+        output_dir/{train,val}/{fire,no_fire}/<image>
+        output_dir/manifest.csv : split, file_name, label, n_boxes, path
+    (path : chemin de l'image copiée, relatif à output_dir ; les images absentes du disque
+    sont écartées, un nom déjà pris dans un dossier est suffixé par l'id de l'image)
+
+    Returns :
+        pd.DataFrame : le manifeste
+    """
+    dfs = coco_to_dataframes(load_coco_annotations(coco_json_path), images_dir)
+    images_df = dfs["images"]
+    annotations_df = dfs.get("annotations", pd.DataFrame(columns=["id", "image_id"]))
+
+    negatives = images_without_annotations(images_df, annotations_df, images_dir)
+    n_boxes = annotations_df.groupby("image_id").size() if len(annotations_df) else pd.Series(dtype=int)
+    manifest = images_df[["id", "file_name", "file_path"]].copy()
+    exists = manifest["file_path"].map(os.path.exists)
+    if not exists.all():
+        print(f"[INFO] {int((~exists).sum())} images absentes du disque ignorées")
+    manifest = manifest[exists].reset_index(drop=True)
+    manifest["label"] = POSITIVE
+    manifest.loc[manifest["id"].isin(negatives["id"]), "label"] = NEGATIVE
+    manifest["n_boxes"] = manifest["id"].map(n_boxes).fillna(0).astype(int)
+
+    stratify = manifest["label"] if manifest["label"].nunique() > 1 else None
+    train_idx, val_idx = train_test_split(manifest.index, test_size=val_size, random_state=seed, stratify=stratify)
+    manifest["split"] = "train"
+    manifest.loc[val_idx, "split"] = "val"
+
+    out = Path(output_dir)
+    for split in ("train", "val"):
+        for label in (POSITIVE, NEGATIVE):
+            (out / split / label).mkdir(parents=True, exist_ok=True)
+    paths, used = [], set()
+    for image_id, src, split, label, name in manifest[["id", "file_path", "split", "label", "file_name"]].itertuples(index=False):
+        rel = Path(split) / label / Path(name).name
+        if rel in used:
+            rel = rel.with_name(f"{rel.stem}_{image_id}{rel.suffix}")
+        used.add(rel)
+        paths.append(rel.as_posix())
+        dst = out / rel
+        if dst.exists():
+            continue
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+    manifest["path"] = paths
+
+    manifest = manifest.drop(columns=["file_path"])
+    manifest.to_csv(out / "manifest.csv", index=False)
+    counts = manifest.groupby(["split", "label"]).size()
+    print(f"[INFO] Dataset de classification → {output_dir}")
+    for (split, label), n in counts.items():
+        print(f"  - {split}/{label} : {n}")
+    return manifest
+
+
+if __name__ == "__main__":
+    ## Fichiers et dossiers à adapter
+    build_classification_dataset(
+        coco_json_path="data/_annotations.coco.json",   # COCO brut (contient les images sans annotation)
+        images_dir="data/images",
+        output_dir="data/dataset_cls",
+    )
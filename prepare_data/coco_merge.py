@@ -0,0 +1,236 @@
+# prepare_data/coco_merge.py
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes
+
+
+# =================== Empreintes ===================
+def file_sha1(path: str) -> Optional[str]:
+    """Empreinte SHA-1 du contenu d'un fichier (None si le fichier est absent)."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_images(file_paths: Sequence[str], workers: int = 8) -> list[Optional[str]]:
+    """Calcule les empreintes de contenu des images en parallèle (lecture disque)."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(file_sha1, file_paths))
+
+
+def category_key(name: str) -> str:
+    """Clé d'unification des catégories : nom sans espaces superflus, en minuscules."""
+    return str(name).strip().lower()
+
+
+# =================== Fusion ===================
+def _to_records(df: pd.DataFrame) -> list[dict]:
+    """
+    Lignes d'un DataFrame en dicts JSON : les champs absents de certains enregistrements
+    (NaN ajoutés par pandas) sont retirés, les entiers restent des entiers.
+    """
+    records = df.convert_dtypes().to_dict(orient="records")
+    return [{k: v for k, v in r.items()
+             if not (v is None or v is pd.NA or (isinstance(v, float) and math.isnan(v)))}
+            for r in records]
+
+
+def _write_array(f, records: list[dict], first: bool) -> bool:
+    """Écrit des objets JSON à la suite dans un tableau déjà ouvert ; renvoie le nouvel état 'first'."""
+    for record in records:
+        if not first:
+            f.write(",\n")
+        f.write(json.dumps(record, ensure_ascii=False, default=int))
+        first = False
+    return first
+
+
+def merge_coco_files(sources: Sequence[tuple], output_file: str,
+                     output_images_dir: Optional[str] = None,
+                     keep_duplicate_annotations: bool = False, workers: int = 8) -> dict:
+    """
+    Fusionne plusieurs exports COCO en un seul fichier, en renumérotant les ids.
+
+    - Les catégories sont unifiées par nom (insensible à la casse).
+    - Les images identiques (même contenu) ne sont gardées qu'une fois ; par défaut seules les
+      annotations de la première source sont conservées. Sans dossier d'images, le contenu est
+      inconnu : aucune image n'est dédoublonnée, les noms en collision sont renommés.
+    - Un nom de fichier déjà utilisé par une autre image est renommé (suffixe _<source>,
+      puis _<source>_<n> tant que le nom est pris).
+    - Les images listées mais absentes du dossier d'images sont ignorées (avec leurs annotations)
+      et comptées dans stats["missing"].
+    - Les sources sont traitées une par une et le résultat est écrit au fil de l'eau :
+      seuls les index (nom de fichier, empreinte) restent en mémoire. L'écriture se fait dans
+      un fichier temporaire renommé à la fin : en cas d'erreur, output_file n'est pas tronqué.
+
+    Args :
+        sources (Sequence[tuple]) : couples (fichier COCO, dossier d'images ou None)
+        output_file (str) : fichier COCO fusionné
+        output_images_dir (str) : si fourni, les images y sont liées (ou copiées) sous leur nom final
+        keep_duplicate_annotations (bool) : garder aussi les annotations des images en double
+    Returns :
+        dict : statistiques de fusion
+    """
+    name_index: dict[str, int] = {}      # file_name => nouvel id image
+    hash_index: dict[str, int] = {}      # empreinte => nouvel id image
+    categories: dict[str, dict] = {}     # clé de catégorie => catégorie fusionnée
+    stats = {"sources": [], "images": 0, "annotations": 0, "duplicates": 0, "renamed": 0, "missing": 0}
+
+    if output_images_dir:
+        Path(output_images_dir).mkdir(parents=True, exist_ok=True)
+    output = Path(output_file)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    partial = output.with_name(output.name + ".tmp")   # renommé en output_file à la fin
+    next_image_id, next_ann_id = 1, 1
+    try:
+        with tempfile.TemporaryFile("w+", encoding="utf-8", dir=output.parent) as spool, \
+                open(partial, "w", encoding="utf-8") as f:
+            f.write('{\n"images": [\n')
+            first_image, first_ann = True, True
+
+            for source_idx, (annotations_file, images_dir) in enumerate(sources):
+                dfs = coco_to_dataframes(load_coco_annotations(annotations_file), images_dir)
+                images_df = dfs.get("images", pd.DataFrame(columns=["id", "file_name"]))
+                annotations_df = dfs.get("annotations", pd.DataFrame(columns=["id", "image_id", "category_id"]))
+                categories_df = dfs.get("categories", pd.DataFrame(columns=["id", "name"]))
+                if annotations_df.empty:
+                    annotations_df = pd.DataFrame(columns=["id", "image_id", "category_id"])
+
+                # --- 1. Catégories : unification par nom ---
+                cat_map = {}
+                for cat in categories_df.to_dict(orient="records"):
+                    key = category_key(cat["name"])
+                    if key not in categories:
+                        categories[key] = {**cat, "id": len(categories) + 1}
+                    cat_map[cat["id"]] = categories[key]["id"]
+
+                # --- 2. Images : dédoublonnage par empreinte ou par nom ---
+                if images_dir:
+                    hashes = hash_images(images_df["file_path"].tolist(), workers)
+                else:
+                    hashes = [None] * len(images_df)
+                file_names = images_df["file_name"].tolist()
+                new_ids = np.zeros(len(images_df), dtype=np.int64)
+                is_new = np.zeros(len(images_df), dtype=bool)
+                missing = np.array([images_dir is not None and h is None for h in hashes], dtype=bool)
+                final_names = list(file_names)
+                renamed = 0
+                for i, (file_name, content_hash) in enumerate(zip(file_names, hashes)):
+                    if missing[i]:
+                        continue
+                    # Sans dossier d'images, un même nom ne prouve pas une même image : pas de dédoublonnage
+                    existing = hash_index.get(content_hash) if content_hash else None
+                    if existing is not None:
+                        new_ids[i] = existing
+                        continue
+                    if file_name in name_index:
+                        final_names[i] = _free_name(file_name, source_idx, name_index)
+                        renamed += 1
+                    new_ids[i] = next_image_id
+                    next_image_id += 1
+                    is_new[i] = True
+                    name_index[final_names[i]] = new_ids[i]
+                    if content_hash:
+                        hash_index[content_hash] = new_ids[i]
+
+                # --- 3. Renumérotation vectorisée ---
+                image_map = pd.Series(new_ids[~missing], index=images_df["id"].to_numpy()[~missing])
+                new_images = images_df.assign(id=new_ids, file_name=final_names)[is_new]
+                if images_dir and output_images_dir:
+                    for src, dst in zip(new_images["file_path"], new_images["file_name"]):
+                        _link_or_copy(src, Path(output_images_dir) / dst)
+                new_images = new_images.drop(columns=["file_path"], errors="ignore")
+
+                ann = annotations_df
+                if not keep_duplicate_annotations and len(ann):
+                    kept_ids = images_df["id"].to_numpy()[is_new]
+                    ann = ann[ann["image_id"].isin(kept_ids)]
+                ann = ann.assign(image_id=ann["image_id"].map(image_map),
+                                 category_id=ann["category_id"].map(cat_map))
+                ann = ann.dropna(subset=["image_id", "category_id"])
+                ann = ann.assign(id=np.arange(next_ann_id, next_ann_id + len(ann)),
+                                 image_id=ann["image_id"].astype(np.int64),
+                                 category_id=ann["category_id"].astype(np.int64))
+                next_ann_id += len(ann)
+
+                # --- 4. Écriture au fil de l'eau ---
+                first_image = _write_array(f, _to_records(new_images), first_image)
+                first_ann = _write_array(spool, _to_records(ann), first_ann)
+
+                stats["sources"].append({
+                    "file": annotations_file,
+                    "images": len(images_df),
+                    "new_images": int(is_new.sum()),
+                    "annotations": len(ann),
+                })
+                stats["images"] += int(is_new.sum())
+                stats["annotations"] += len(ann)
+                stats["duplicates"] += int((~is_new & ~missing).sum())
+                stats["renamed"] += renamed
+                stats["missing"] += int(missing.sum())
+                print(f"[INFO] {annotations_file} : {int(is_new.sum())}/{len(images_df)} images, {len(ann)} annotations"
+                      + (f" ({int(missing.sum())} images absentes du disque ignorées)" if missing.any() else ""))
+
+            # Recopier les annotations mises en attente, puis les catégories
+            f.write('\n],\n"annotations": [\n')
+            spool.seek(0)
+            shutil.copyfileobj(spool, f)
+            f.write('\n],\n"categories": ')
+            f.write(json.dumps(list(categories.values()), ensure_ascii=False, default=int))
+            f.write("\n}\n")
+
+        os.replace(partial, output)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    stats["categories"] = len(categories)
+    print(f"[INFO] Fusion COCO : {stats['images']} images ({stats['duplicates']} doublons, "
+          f"{stats['renamed']} renommées, {stats['missing']} absentes du disque), "
+          f"{stats['annotations']} annotations, {stats['categories']} catégories → {output_file}")
+    return stats
+
+
+def _free_name(file_name: str, source_idx: int, name_index: dict) -> str:
+    """Premier nom libre pour une image dont le nom est déjà pris : x_<source>.jpg, x_<source>_1.jpg, ..."""
+    stem, ext = os.path.splitext(file_name)
+    candidate, n = f"{stem}_{source_idx}{ext}", 0
+    while candidate in name_index:
+        n += 1
+        candidate = f"{stem}_{source_idx}_{n}{ext}"
+    return candidate
+
+
+def _link_or_copy(src: str, dst: Path):
+    """Crée un lien physique vers l'image (copie si le lien est impossible)."""
+    if dst.exists():
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+if __name__ == "__main__":
+    ## Exports à fusionner (fichier COCO, dossier d'images)
+    sources = [
+        ("data/raw/vendor_a/_annotations.coco.json", "data/raw/vendor_a/images"),
+        ("data/raw/vendor_b/_annotations.coco.json", "data/raw/vendor_b/images"),
+    ]
+    merge_coco_files(sources, "data/_annotations.coco.json", output_images_dir="data/images")
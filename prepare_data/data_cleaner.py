@@ -1,7 +1,8 @@
 from pathlib import Path
-import os
 from typing import Optional, Union
+import numpy as np
 import pandas as pd
+from prepare_data.dir_index import get_directory_index
 
 
 # =================== Gestion des fichiers ===================
@@ -13,7 +14,8 @@ def get_file_extensions(folder_path: str):
     if not folder.exists() or not folder.is_dir():
         raise FileNotFoundError(f"Le dossier {folder_path} est introuvable.")
 
-    extensions = list({f.suffix.lower() for f in folder.iterdir() if f.is_file() and f.suffix})
+    index = get_directory_index(folder)
+    extensions = list({Path(name).suffix.lower() for name in index.names() if Path(name).suffix})
     return extensions
 
 
@@ -22,7 +24,7 @@ def check_images_consistency(images_df, images_dir):
     Vérifie la cohérence entre les images du JSON COCO et celles présentes physiquement.
     """
     declared_files = set(images_df["file_name"].tolist())
-    actual_files = set(os.listdir(images_dir))
+    actual_files = get_directory_index(images_dir).names()
     missing_files = declared_files - actual_files
     unreferenced_files = actual_files - declared_files
 
@@ -96,6 +98,21 @@ def fix_bbox(row, img_w, img_h):
     h = max(1, y_max - y)
     return [x, y, w, h]
 
+
+def fix_bboxes(bboxes: np.ndarray, img_w: float, img_h: float) -> np.ndarray:
+    """
+    Version vectorisée de fix_bbox : corrige un tableau (N, 4) de bounding boxes [x, y, w, h]
+    pour qu'elles soient contenues dans l'image.
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    x_max = np.minimum(bboxes[:, 0] + bboxes[:, 2], img_w)
+    y_max = np.minimum(bboxes[:, 1] + bboxes[:, 3], img_h)
+    x = np.maximum(bboxes[:, 0], 0)
+    y = np.maximum(bboxes[:, 1], 0)
+    w = np.maximum(1, x_max - x)
+    h = np.maximum(1, y_max - y)
+    return np.stack([x, y, w, h], axis=1)
+
 # =================== Correction ciblée des bounding boxes ===================
 def correct_bboxes(images_df: pd.DataFrame, annotations_df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
     """
@@ -0,0 +1,176 @@
+# prepare_data/dir_index.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+# Dossier des index persistants (un fichier par dossier indexé). Persistance à activer par
+# set_index_cache_dir (scripts du pipeline) ou la variable DIR_INDEX_CACHE ; None = index en mémoire
+INDEX_CACHE_DIR: Optional[Path] = Path(os.environ["DIR_INDEX_CACHE"]) if os.environ.get("DIR_INDEX_CACHE") else None
+
+
+def _scan_dir(path: str) -> tuple[int, dict, list]:
+    """
+    Liste un dossier avec os.scandir.
+    Returns :
+        tuple : mtime du dossier, fichiers {nom: [taille, mtime]}, sous-dossiers
+    """
+    mtime = os.stat(path).st_mtime_ns
+    files, subdirs = {}, []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+    return mtime, files, sorted(subdirs)
+
+
+class DirectoryIndex:
+    """
+    Index d'un dossier (noms, tailles, dates de modification) construit une seule fois
+    avec os.scandir puis rafraîchi de façon incrémentale : seuls les dossiers dont la date
+    de modification a changé (ajout, suppression ou renommage de fichiers) sont relistés.
+
+    Remarque : un fichier réécrit sur place ne change pas la date de son dossier,
+    sa taille et sa date dans l'index peuvent donc être en retard.
+    """
+
+    def __init__(self, root: Union[str, Path], recursive: bool = False,
+                 index_file: Optional[str] = None, workers: int = 8):
+        self.root = Path(root)
+        if not self.root.exists() or not self.root.is_dir():
+            raise FileNotFoundError(f"Le dossier {root} est introuvable.")
+        self.recursive = recursive
+        self.index_file = index_file
+        self.workers = workers
+        self.dirs: dict[str, dict] = {}  # dossier relatif ("" = racine) => mtime_ns, files, subdirs
+
+        if index_file and Path(index_file).exists():
+            try:
+                with open(index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                data = {}  # index illisible => reconstruit
+            if data.get("root") == str(self.root.resolve()) and data.get("recursive") == recursive:
+                self.dirs = data["dirs"]
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Met à jour l'index ; renvoie le nombre de dossiers relistés."""
+        previous, self.dirs = self.dirs, {}
+        level, rescanned = [""], 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while level:
+                paths = [str(self.root / rel) if rel else str(self.root) for rel in level]
+                mtimes = list(pool.map(_safe_mtime, paths))
+
+                to_scan = [i for i, (rel, m) in enumerate(zip(level, mtimes))
+                           if m is not None and (rel not in previous or previous[rel]["mtime_ns"] != m)]
+                scanned = dict(zip(to_scan, pool.map(_scan_dir, [paths[i] for i in to_scan])))
+                rescanned += len(to_scan)
+
+                next_level = []
+                for i, rel in enumerate(level):
+                    if mtimes[i] is None:
+                        continue  # dossier supprimé
+                    if i in scanned:
+                        mtime, files, subdirs = scanned[i]
+                        self.dirs[rel] = {"mtime_ns": mtime, "files": files, "subdirs": subdirs}
+                    else:
+                        self.dirs[rel] = previous[rel]
+                    if self.recursive:
+                        next_level += [f"{rel}/{d}" if rel else d for d in self.dirs[rel]["subdirs"]]
+                level = next_level
+
+        self.last_rescanned = rescanned
+        return rescanned
+
+    def save(self):
+        """Sauvegarde l'index (si index_file est défini) pour les prochaines exécutions."""
+        if not self.index_file:
+            return
+        Path(self.index_file).parent.mkdir(parents=True, exist_ok=True)
+        partial = f"{self.index_file}.{os.getpid()}.tmp"  # écriture atomique (plusieurs processus)
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump({"root": str(self.root.resolve()), "recursive": self.recursive, "dirs": self.dirs}, f)
+        os.replace(partial, self.index_file)
+
+    def names(self, reldir: str = "") -> set[str]:
+        """Noms des fichiers d'un dossier de l'index (racine par défaut)."""
+        entry = self.dirs.get(reldir.strip("/"))
+        return set(entry["files"]) if entry else set()
+
+    def stat(self, relpath: str) -> Optional[tuple[int, int]]:
+        """(taille, mtime_ns) d'un fichier de l'index, ou None s'il est absent."""
+        reldir, _, name = relpath.replace(os.sep, "/").rpartition("/")
+        entry = self.dirs.get(reldir)
+        if entry is None or name not in entry["files"]:
+            return None
+        size, mtime = entry["files"][name]
+        return size, mtime
+
+    def exists(self, relpath: str) -> bool:
+        """Indique si un fichier (chemin relatif à la racine) est présent dans l'index."""
+        return self.stat(relpath) is not None
+
+    def iter_files(self):
+        """Génère (chemin relatif, taille, mtime_ns) pour tous les fichiers indexés."""
+        for reldir, entry in self.dirs.items():
+            for name, (size, mtime) in entry["files"].items():
+                yield (f"{reldir}/{name}" if reldir else name), size, mtime
+
+
+def _safe_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# =================== Index partagé ===================
+_INDEXES: dict[tuple, DirectoryIndex] = {}
+
+
+def set_index_cache_dir(path: Optional[Union[str, Path]]):
+    """Active (dossier) ou désactive (None) la sauvegarde des index de get_directory_index."""
+    global INDEX_CACHE_DIR
+    INDEX_CACHE_DIR = Path(path) if path else None
+
+
+def default_index_file(folder_path: Union[str, Path], recursive: bool = False) -> Optional[str]:
+    """Fichier d'index persistant d'un dossier dans INDEX_CACHE_DIR (None si la persistance est désactivée)."""
+    if INDEX_CACHE_DIR is None:
+        return None
+    key = hashlib.sha1(f"{Path(folder_path).resolve()}:{recursive}".encode()).hexdigest()[:16]
+    return str(Path(INDEX_CACHE_DIR) / f"{key}.json")
+
+
+def get_directory_index(folder_path: Union[str, Path], recursive: bool = False,
+                        index_file: Optional[str] = None) -> DirectoryIndex:
+    """
+    Retourne l'index partagé d'un dossier : construit au premier appel,
+    simplement rafraîchi (incrémental) aux appels suivants.
+    Si la persistance est activée (index_file ou INDEX_CACHE_DIR), l'index est sauvegardé :
+    un nouveau processus ne reliste que les dossiers modifiés depuis la dernière exécution.
+    """
+    index_file = index_file or default_index_file(folder_path, recursive)
+    key = (str(Path(folder_path).resolve()), recursive)
+    index = _INDEXES.get(key)
+    if index is None:
+        index = DirectoryIndex(folder_path, recursive=recursive, index_file=index_file)
+        _INDEXES[key] = index
+    else:
+        if not index.root.is_dir():
+            del _INDEXES[key]
+            raise FileNotFoundError(f"Le dossier {folder_path} est introuvable.")
+        index.refresh()
+    if index_file and (index.last_rescanned or index.index_file != index_file):
+        index.index_file = index_file
+        index.save()
+    return index
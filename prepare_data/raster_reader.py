@@ -0,0 +1,294 @@
+# prepare_data/raster_reader.py
+
+import json
+import math
+import mmap
+from pathlib import Path
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+import tifffile
+
+# Tags GeoTIFF utilisés pour le géoréférencement
+MODEL_PIXEL_SCALE_TAG = 33550
+MODEL_TIEPOINT_TAG = 33922
+MODEL_TRANSFORMATION_TAG = 34264
+
+# Compressions JPEG : le décodage a besoin des tables partagées (tag JPEGTables)
+JPEG_COMPRESSIONS = {6, 7, 33007, 34892}
+# Taille maximale d'un strip compressé (décodé en entier à chaque lecture)
+MAX_COMPRESSED_STRIP_PIXELS = 4096 * 4096
+
+
+# =================== Géoréférencement ===================
+def read_geotransform(page) -> tuple:
+    """
+    Retourne la géotransformation (convention GDAL) d'une page GeoTIFF :
+    (x0, taille_pixel_x, rotation_x, y0, rotation_y, taille_pixel_y).
+    Sans tag GeoTIFF, renvoie l'identité (coordonnées pixel).
+    """
+    tags = page.tags
+    if MODEL_TRANSFORMATION_TAG in tags:
+        m = tags[MODEL_TRANSFORMATION_TAG].value
+        return (m[3], m[0], m[1], m[7], m[4], m[5])
+    if MODEL_PIXEL_SCALE_TAG in tags and MODEL_TIEPOINT_TAG in tags:
+        sx, sy = tags[MODEL_PIXEL_SCALE_TAG].value[:2]
+        i, j, _, x, y, _ = tags[MODEL_TIEPOINT_TAG].value[:6]
+        return (x - i * sx, sx, 0.0, y + j * sy, 0.0, -sy)
+    return (0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def pixel_to_geo(geotransform: Sequence[float], x, y):
+    """Convertit des coordonnées pixel (scalaires ou tableaux) en coordonnées géographiques."""
+    x0, a, b, y0, d, e = geotransform
+    return x0 + x * a + y * b, y0 + x * d + y * e
+
+
+def window_geotransform(geotransform: Sequence[float], x: int, y: int) -> tuple:
+    """Géotransformation d'une fenêtre dont le coin haut gauche est le pixel (x, y)."""
+    x0, a, b, y0, d, e = geotransform
+    gx, gy = pixel_to_geo(geotransform, x, y)
+    return (gx, a, b, gy, d, e)
+
+
+def boxes_to_geo(boxes: np.ndarray, geotransform: Sequence[float]) -> np.ndarray:
+    """
+    Convertit des boîtes pixel (N, 4+) x1, y1, x2, y2 en boîtes géographiques (N, 4) :
+    x_min, y_min, x_max, y_max.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64)
+    if boxes.size == 0:
+        return np.zeros((0, 4))
+    gx1, gy1 = pixel_to_geo(geotransform, boxes[:, 0], boxes[:, 1])
+    gx2, gy2 = pixel_to_geo(geotransform, boxes[:, 2], boxes[:, 3])
+    return np.stack([np.minimum(gx1, gx2), np.minimum(gy1, gy2),
+                     np.maximum(gx1, gx2), np.maximum(gy1, gy2)], axis=1)
+
+
+# =================== Découpage en fenêtres ===================
+def iter_windows(width: int, height: int, size: int = 1024, overlap: int = 0):
+    """
+    Génère les fenêtres (x, y, w, h) couvrant une image, avec recouvrement.
+    Les dernières fenêtres sont recalées sur le bord pour garder une taille constante.
+    """
+    if overlap >= size:
+        raise ValueError("overlap doit être strictement inférieur à size")
+    step = size - overlap
+
+    def starts(length):
+        if length <= size:
+            return [0]
+        positions = list(range(0, length - size, step))
+        positions.append(length - size)
+        return positions
+
+    for y in starts(height):
+        for x in starts(width):
+            yield x, y, min(size, width - x), min(size, height - y)
+
+
+# =================== Conversion en RGB ===================
+def to_rgb_uint8(window: np.ndarray, bands: Sequence[int] = (0, 1, 2),
+                 band_range: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Sélectionne trois bandes et les convertit en RGB uint8.
+    Args :
+        window (np.ndarray) : fenêtre (h, w, bandes)
+        bands (Sequence[int]) : indices des bandes R, G, B (une seule bande => niveaux de gris)
+        band_range (np.ndarray) : (2, 3) bornes min / max par bande ; par défaut la plage du type
+    """
+    if window.ndim == 2:
+        window = window[..., None]
+    bands = list(bands) if window.shape[2] > 1 else [0, 0, 0]
+    data = window[..., bands]
+
+    if band_range is None:
+        if data.dtype == np.uint8:
+            return np.ascontiguousarray(data)
+        if np.issubdtype(data.dtype, np.integer):
+            info = np.iinfo(data.dtype)
+            band_range = np.array([[info.min] * 3, [info.max] * 3])
+        else:
+            band_range = np.array([[0.0] * 3, [1.0] * 3])
+
+    lo, hi = np.asarray(band_range, dtype=np.float32)
+    scaled = (data.astype(np.float32) - lo) / np.maximum(hi - lo, 1e-6) * 255.0
+    return np.nan_to_num(np.clip(scaled, 0, 255)).astype(np.uint8)
+
+
+# =================== Lecteur fenêtré ===================
+class WindowedTiffReader:
+    """
+    Lecteur de GeoTIFF tuilé ou en bandes (strips), fenêtre par fenêtre.
+
+    Le fichier est projeté en mémoire (mmap) : seuls les segments qui recouvrent la fenêtre
+    demandée sont décodés, la mémoire utilisée ne dépend donc pas de la taille de la scène.
+    Les segments non compressés ne sont pas décodés : les lignes et colonnes utiles sont lues
+    directement dans le mmap (un TIFF en un seul strip reste donc lisible fenêtre par fenêtre).
+    Un strip compressé est en revanche décodé en entier : les TIFF compressés dont un strip
+    dépasse MAX_COMPRESSED_STRIP_PIXELS sont refusés (les réécrire tuilés, p. ex. gdal_translate
+    -co TILED=YES).
+    """
+
+    def __init__(self, path: str, bands: Sequence[int] = (0, 1, 2),
+                 band_range: Optional[np.ndarray] = None):
+        file = Path(path)
+        if not file.exists():
+            raise FileNotFoundError(f"Le fichier {path} est introuvable.")
+
+        self.path = str(file)
+        self._tif = tifffile.TiffFile(self.path)
+        self.page = self._tif.pages[0]
+        if self.page.imagedepth > 1:
+            raise ValueError("Les TIFF volumiques (imagedepth > 1) ne sont pas pris en charge.")
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        planes, _, _, _, contig = self.page.shaped
+        self.width = self.page.imagewidth
+        self.height = self.page.imagelength
+        self.samples = planes * contig
+        self.dtype = self.page.dtype
+        self.geotransform = read_geotransform(self.page)
+        self.bands = bands
+        self.band_range = band_range
+
+        if self.page.is_tiled:
+            self._seg_h, self._seg_w = self.page.tilelength, self.page.tilewidth
+        else:
+            self._seg_h, self._seg_w = min(self.page.rowsperstrip, self.height), self.width
+        self._across = math.ceil(self.width / self._seg_w)
+        self._down = math.ceil(self.height / self._seg_h)
+        self._planes, self._contig = planes, contig
+
+        # Segments non compressés : lecture directe dans le mmap, sans décodage
+        self._uncompressed = (self.page.compression == 1 and self.page.fillorder == 1
+                              and self.page.bitspersample == self.dtype.itemsize * 8)
+        self._raw_dtype = self.dtype.newbyteorder(self._tif.byteorder)
+        if (not self._uncompressed and not self.page.is_tiled
+                and self._seg_h * self._seg_w > MAX_COMPRESSED_STRIP_PIXELS):
+            self.close()
+            raise ValueError(f"Strips compressés de {self._seg_h} lignes : chaque fenêtre décoderait "
+                             f"{self._seg_h * self._seg_w} pixels. Réécrire le TIFF en tuiles.")
+        self._decodeargs = {"_fullsize": self.page.is_tiled}
+        if self.page.compression in JPEG_COMPRESSIONS:
+            self._decodeargs["jpegtables"] = self.page.jpegtables
+            self._decodeargs["jpegheader"] = self.page.keyframe.jpegheader
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libère le mmap et les fichiers ouverts."""
+        self._mm.close()
+        self._file.close()
+        self._tif.close()
+
+    def _raw_segment(self, offset: int, count: int) -> np.ndarray:
+        """Vue (lignes, largeur, bandes) sur un segment non compressé du mmap (aucune copie)."""
+        row = self._seg_w * self._contig
+        rows = min(self._seg_h, count // (row * self.dtype.itemsize))
+        data = np.frombuffer(self._mm, dtype=self._raw_dtype, count=rows * row, offset=offset)
+        return data.reshape(rows, self._seg_w, self._contig)
+
+    def read_window(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        """Lit la fenêtre (x, y, w, h) avec toutes ses bandes : tableau (h, w, bandes)."""
+        x2, y2 = min(x + w, self.width), min(y + h, self.height)
+        x, y = max(x, 0), max(y, 0)
+        out = np.zeros((y2 - y, x2 - x, self.samples), dtype=self.dtype)
+
+        rows = range(y // self._seg_h, (y2 - 1) // self._seg_h + 1)
+        cols = range(x // self._seg_w, (x2 - 1) // self._seg_w + 1)
+        offsets, counts = self.page.dataoffsets, self.page.databytecounts
+        for plane in range(self._planes):
+            for r in rows:
+                for c in cols:
+                    index = plane * self._down * self._across + r * self._across + c
+                    if counts[index] == 0:
+                        continue  # segment absent (TIFF creux) => zéros
+                    sy, sx = r * self._seg_h, c * self._seg_w
+                    if self._uncompressed:
+                        segment = self._raw_segment(offsets[index], counts[index])
+                    else:
+                        raw = self._mm[offsets[index]:offsets[index] + counts[index]]
+                        segment = self.page.decode(raw, index, **self._decodeargs)[0][0]
+
+                    # Intersection du segment avec la fenêtre
+                    ix1, iy1 = max(x, sx), max(y, sy)
+                    ix2 = min(x2, sx + segment.shape[1], self.width)
+                    iy2 = min(y2, sy + segment.shape[0], self.height)
+                    if ix2 <= ix1 or iy2 <= iy1:
+                        continue
+                    out[iy1 - y:iy2 - y, ix1 - x:ix2 - x,
+                        plane * self._contig:(plane + 1) * self._contig] = \
+                        segment[iy1 - sy:iy2 - sy, ix1 - sx:ix2 - sx]
+        return out
+
+    def read_rgb(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        """Lit la fenêtre (x, y, w, h) et la convertit en RGB uint8."""
+        return to_rgb_uint8(self.read_window(x, y, w, h), self.bands, self.band_range)
+
+    def iter_rgb_windows(self, size: int = 1024, overlap: int = 0):
+        """Génère (x, y, image RGB uint8) pour toutes les fenêtres de la scène."""
+        for x, y, w, h in iter_windows(self.width, self.height, size, overlap):
+            yield x, y, self.read_rgb(x, y, w, h)
+
+    def estimate_band_range(self, percentiles: tuple = (2, 98), samples: int = 16,
+                            size: int = 256) -> np.ndarray:
+        """
+        Estime les bornes de normalisation des bandes RGB sur un échantillon de fenêtres
+        réparties sur la scène (évite les écarts de contraste entre fenêtres).
+        """
+        grid = max(1, int(math.sqrt(samples)))
+        values = []
+        for gy in range(grid):
+            for gx in range(grid):
+                x = int((self.width - size) * gx / max(grid - 1, 1)) if self.width > size else 0
+                y = int((self.height - size) * gy / max(grid - 1, 1)) if self.height > size else 0
+                window = self.read_window(x, y, size, size)
+                bands = list(self.bands) if self.samples > 1 else [0, 0, 0]
+                values.append(window[..., bands].reshape(-1, 3))
+        values = np.concatenate(values).astype(np.float64)
+        return np.nanpercentile(values, percentiles, axis=0)
+
+
+# =================== Export de tuiles pour le dataset ===================
+def export_tiles(path: str, output_dir: str, size: int = 640, overlap: int = 64,
+                 bands: Sequence[int] = (0, 1, 2), ext: str = ".jpg",
+                 band_range: Optional[np.ndarray] = None) -> dict:
+    """
+    Découpe une scène GeoTIFF en tuiles RGB et écrit un COCO (sans annotations)
+    dont chaque image garde son décalage et sa géotransformation dans la scène.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    with WindowedTiffReader(path, bands) as reader:
+        reader.band_range = band_range if band_range is not None else (
+            None if reader.dtype == np.uint8 else reader.estimate_band_range())
+        images = []
+        stem = Path(path).stem
+        for idx, (x, y, rgb) in enumerate(reader.iter_rgb_windows(size, overlap), start=1):
+            file_name = f"{stem}_{x}_{y}{ext}"
+            cv2.imwrite(str(output / file_name), cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+            images.append({
+                "id": idx,
+                "file_name": file_name,
+                "width": rgb.shape[1],
+                "height": rgb.shape[0],
+                "source": Path(path).name,
+                "x_offset": x,
+                "y_offset": y,
+                "geotransform": list(window_geotransform(reader.geotransform, x, y)),
+            })
+
+    coco = {"images": images, "annotations": [], "categories": []}
+    with open(output / "tiles.json", "w", encoding="utf-8") as f:
+        json.dump(coco, f, indent=2, ensure_ascii=False)
+
+    print(f"[INFO] {len(images)} tuiles écrites → {output}")
+    return coco
@@ -0,0 +1,166 @@
+# prepare_data/reencode.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes, save_coco_annotations
+
+ENCODE_PARAMS = {
+    ".jpg": lambda q: [cv2.IMWRITE_JPEG_QUALITY, q],
+    ".webp": lambda q: [cv2.IMWRITE_WEBP_QUALITY, q],
+}
+
+
+# =================== Réencodage d'une image ===================
+def _reencode_image(args) -> dict:
+    """
+    Réencode une image (sans métadonnées EXIF, cv2.imwrite ne les recopie pas)
+    et la réduit si son plus grand côté dépasse max_side.
+    """
+    src, dst, ext, quality, max_side = args
+    start = time.perf_counter()
+    # Ignorer l'orientation EXIF : les annotations sont exprimées dans le repère des pixels stockés
+    img = cv2.imread(src, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+    if img is None:
+        return {"src": src, "ok": False}
+
+    h, w = img.shape[:2]
+    scale = 1.0
+    if max_side and max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    new_h, new_w = img.shape[:2]
+
+    cv2.imwrite(dst, img, ENCODE_PARAMS[ext](quality))
+    return {
+        "src": src,
+        "ok": True,
+        "bytes_before": os.path.getsize(src),
+        "bytes_after": os.path.getsize(dst),
+        "scale_x": new_w / w,
+        "scale_y": new_h / h,
+        "width": new_w,
+        "height": new_h,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _output_names(file_names: list[str], ext: str) -> list[str]:
+    """Nouveaux noms de fichiers ; en cas de collision (a.png / a.tif) l'ancienne extension est gardée."""
+    stems = [str(Path(name).with_suffix("")) for name in file_names]
+    counts = pd.Series(stems).value_counts()
+    return [f"{stem}{ext}" if counts[stem] == 1 else f"{stem}_{Path(name).suffix.lstrip('.')}{ext}"
+            for stem, name in zip(stems, file_names)]
+
+
+def _scale_segmentation(segmentation, sx: float, sy: float):
+    """Met à l'échelle des polygones COCO (les RLE sont laissés tels quels)."""
+    if not isinstance(segmentation, list):
+        return segmentation
+    return [[v * (sx if i % 2 == 0 else sy) for i, v in enumerate(poly)] for poly in segmentation]
+
+
+# =================== Réencodage du dataset ===================
+def reencode_dataset(coco_json_path: str, images_dir: str, output_dir: str, output_json: str,
+                     fmt: str = "jpg", quality: int = 90, max_side: Optional[int] = None,
+                     workers: Optional[int] = None) -> dict:
+    """
+    Réencode toutes les images d'un COCO (JPEG ou WebP), en parallèle, et met à jour
+    file_name, width, height et les bounding boxes.
+    Args :
+        coco_json_path (str) : COCO d'entrée
+        images_dir (str) : dossier des images d'origine
+        output_dir (str) : dossier des images réencodées
+        output_json (str) : COCO de sortie
+        fmt (str) : "jpg" ou "webp"
+        quality (int) : qualité d'encodage (0-100)
+        max_side (int) : plus grand côté maximal en pixels (None = taille d'origine)
+        workers (int) : nombre de processus (par défaut os.cpu_count())
+    Returns :
+        dict : rapport (octets avant / après, ratio, durée, images ignorées)
+    """
+    ext = f".{fmt.lower().lstrip('.')}".replace(".jpeg", ".jpg")
+    if ext not in ENCODE_PARAMS:
+        raise ValueError(f"Format {fmt} non supporté (jpg ou webp)")
+
+    start = time.perf_counter()
+    coco = load_coco_annotations(coco_json_path)
+    dfs = coco_to_dataframes(coco, images_dir)
+    images_df = dfs["images"]
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    new_names = _output_names(images_df["file_name"].tolist(), ext)
+    for name in new_names:
+        (out / name).parent.mkdir(parents=True, exist_ok=True)
+    tasks = [(src, str(out / name), ext, quality, max_side)
+             for src, name in zip(images_df["file_path"], new_names)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_reencode_image, tasks, chunksize=8))
+    report_df = pd.DataFrame([r for r in results if r["ok"]])
+    ok = np.array([r["ok"] for r in results], dtype=bool)
+
+    # --- Mise à jour des images ---
+    images_df = images_df.assign(file_name=new_names)[ok].drop(columns=["file_path"])
+    if len(report_df):
+        images_df = images_df.assign(width=report_df["width"].to_numpy(), height=report_df["height"].to_numpy())
+        scales = pd.DataFrame({"image_id": images_df["id"].to_numpy(),
+                               "sx": report_df["scale_x"].to_numpy(), "sy": report_df["scale_y"].to_numpy()})
+    else:
+        scales = pd.DataFrame(columns=["image_id", "sx", "sy"])
+
+    # --- Mise à l'échelle vectorisée des annotations ---
+    annotations_df = dfs.get("annotations", pd.DataFrame(columns=["id", "image_id", "bbox"]))
+    if len(annotations_df):
+        annotations_df = annotations_df[annotations_df["image_id"].isin(scales["image_id"])]
+        s = annotations_df[["image_id"]].merge(scales, on="image_id", how="left")
+        sx, sy = s["sx"].to_numpy(), s["sy"].to_numpy()
+        bboxes = np.array(annotations_df["bbox"].tolist(), dtype=np.float64).reshape(-1, 4)
+        bboxes *= np.stack([sx, sy, sx, sy], axis=1)
+        annotations_df = annotations_df.assign(bbox=bboxes.tolist())
+        if "area" in annotations_df.columns:
+            annotations_df = annotations_df.assign(area=annotations_df["area"].to_numpy() * sx * sy)
+        if "segmentation" in annotations_df.columns:
+            annotations_df = annotations_df.assign(segmentation=[
+                _scale_segmentation(seg, x, y) for seg, x, y in zip(annotations_df["segmentation"], sx, sy)])
+
+    dfs["images"] = images_df
+    dfs["annotations"] = annotations_df
+    save_coco_annotations(coco, dfs, output_json)
+
+    before = int(report_df["bytes_before"].sum()) if len(report_df) else 0
+    after = int(report_df["bytes_after"].sum()) if len(report_df) else 0
+    report = {
+        "images": int(ok.sum()),
+        "skipped": int((~ok).sum()),
+        "bytes_before": before,
+        "bytes_after": after,
+        "ratio": before / after if after else float("nan"),
+        "seconds": time.perf_counter() - start,
+    }
+    print(f"[INFO] Réencodage {ext} (qualité {quality}, côté max {max_side}) :")
+    print(f"  - images : {report['images']} (ignorées : {report['skipped']})")
+    print(f"  - taille : {before / 1e6:.1f} Mo → {after / 1e6:.1f} Mo (÷{report['ratio']:.1f})")
+    print(f"  - durée : {report['seconds']:.1f} s")
+    return report
+
+
+if __name__ == "__main__":
+    ## Fichiers et dossiers à adapter
+    reencode_dataset(
+        coco_json_path="data/annotations_clean.json",
+        images_dir="data/images",
+        output_dir="data/images_jpg",
+        output_json="data/annotations_clean_jpg.json",
+        fmt="jpg",
+        quality=90,
+        max_side=2048,
+    )
@@ -0,0 +1,196 @@
+# prepare_data/tiling.py
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from prepare_data.data_cleaner import fix_bboxes
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes
+from prepare_data.raster_reader import WindowedTiffReader, iter_windows
+
+TIFF_EXTENSIONS = {".tif", ".tiff"}
+
+
+# =================== Découpage des boîtes ===================
+def clip_boxes_to_tile(bboxes: np.ndarray, tile_x: int, tile_y: int, tile_w: int, tile_h: int,
+                       min_visibility: float = 0.3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ramène des boîtes COCO (N, 4) dans le repère d'une tuile et les coupe à ses bords.
+    Returns :
+        tuple : boîtes corrigées (fix_bboxes) des annotations gardées, masque des annotations gardées
+                (fraction visible >= min_visibility)
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    shifted = bboxes - np.array([tile_x, tile_y, 0, 0])
+
+    # Surface visible avant la correction (fix_bbox impose une taille minimale de 1 px)
+    vis_w = np.clip(np.minimum(shifted[:, 0] + shifted[:, 2], tile_w) - np.maximum(shifted[:, 0], 0), 0, None)
+    vis_h = np.clip(np.minimum(shifted[:, 1] + shifted[:, 3], tile_h) - np.maximum(shifted[:, 1], 0), 0, None)
+    area = np.maximum(bboxes[:, 2] * bboxes[:, 3], 1e-9)
+    keep = (vis_w > 0) & (vis_h > 0) & (vis_w * vis_h / area >= min_visibility)
+
+    return fix_bboxes(shifted[keep], tile_w, tile_h), keep
+
+
+# =================== Découpage d'une image ===================
+def _tile_image(args) -> list[tuple[dict, np.ndarray, np.ndarray]]:
+    """
+    Découpe une image en tuiles et écrit celles qui sont gardées.
+    Returns :
+        list : (tuile, boîtes (N, 4), catégories (N,)) pour chaque tuile écrite
+    """
+    (image, bboxes, cat_ids, images_dir, output_images, tile_size, overlap,
+     min_visibility, empty_ratio, ext, seed) = args
+    path = Path(images_dir) / image["file_name"]
+    rng = np.random.default_rng(seed)
+    stem = Path(image["file_name"]).stem
+
+    reader, img = None, None
+    if path.suffix.lower() in TIFF_EXTENSIONS:
+        reader = WindowedTiffReader(str(path))
+        if reader.dtype != np.uint8:
+            # même normalisation que export_tiles / detect_raster (tuiles d'entraînement = inférence)
+            reader.band_range = reader.estimate_band_range()
+        width, height = reader.width, reader.height
+    else:
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if img is None:
+            return []
+        height, width = img.shape[:2]
+
+    tiles = []
+    try:
+        for x, y, w, h in iter_windows(width, height, tile_size, overlap):
+            boxes, keep = clip_boxes_to_tile(bboxes, x, y, w, h, min_visibility)
+            if not keep.any() and rng.random() >= empty_ratio:
+                continue  # tuile vide non retenue
+
+            if reader is not None:
+                crop = cv2.cvtColor(reader.read_rgb(x, y, w, h), cv2.COLOR_RGB2BGR)
+            else:
+                crop = img[y:y + h, x:x + w]
+            file_name = f"{stem}_{x}_{y}{ext}"
+            cv2.imwrite(str(Path(output_images) / file_name), crop)
+            tiles.append(({
+                "file_name": file_name,
+                "width": int(w),
+                "height": int(h),
+                "source_image_id": image["id"],
+                "x_offset": int(x),
+                "y_offset": int(y),
+            }, boxes, cat_ids[keep]))
+    finally:
+        if reader is not None:
+            reader.close()
+    return tiles
+
+
+# =================== Génération du dataset en tuiles ===================
+def tile_dataset(coco_json_path: str, images_dir: str, output_dir: str, tile_size: int = 640,
+                 overlap: int = 128, min_visibility: float = 0.3, empty_ratio: float = 0.1,
+                 ext: str = ".jpg", yolo: bool = True, workers: Optional[int] = None,
+                 seed: int = 42) -> dict:
+    """
+    Découpe les images d'un COCO nettoyé en tuiles chevauchantes pour l'entraînement.
+
+    Args :
+        coco_json_path (str) : COCO nettoyé (annotations_clean.json)
+        images_dir (str) : dossier des images sources
+        output_dir (str) : dossier de sortie (images/, labels/, annotations_tiles.json)
+        tile_size (int) : taille des tuiles (pixels)
+        overlap (int) : recouvrement entre tuiles voisines
+        min_visibility (float) : fraction minimale visible d'une boîte pour la garder
+        empty_ratio (float) : proportion de tuiles sans annotation conservées
+        yolo (bool) : écrire aussi les labels au format YOLO
+        workers (int) : nombre de processus (par défaut os.cpu_count())
+    Returns :
+        dict : COCO des tuiles
+    """
+    dfs = coco_to_dataframes(load_coco_annotations(coco_json_path))
+    images_df = dfs["images"]
+    annotations_df = dfs.get("annotations", pd.DataFrame(columns=["image_id", "category_id", "bbox"]))
+    categories = dfs["categories"].to_dict(orient="records") if "categories" in dfs else []
+
+    output = Path(output_dir)
+    (output / "images").mkdir(parents=True, exist_ok=True)
+
+    # Regrouper les boîtes par image une seule fois (tableaux numpy)
+    groups = annotations_df.groupby("image_id").indices if len(annotations_df) else {}
+    all_boxes = np.array(annotations_df["bbox"].tolist(), dtype=np.float64).reshape(-1, 4)
+    all_cats = annotations_df["category_id"].to_numpy() if len(annotations_df) else np.zeros(0, dtype=np.int64)
+    empty = np.zeros(0, dtype=np.int64)
+
+    tasks = []
+    for i, image in enumerate(images_df.to_dict(orient="records")):
+        idx = groups.get(image["id"], empty)
+        tasks.append((image, all_boxes[idx], all_cats[idx], images_dir, str(output / "images"),
+                      tile_size, overlap, min_visibility, empty_ratio, ext, seed + i))
+
+    if workers == 1:
+        results = map(_tile_image, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_tile_image, tasks, chunksize=4)
+
+    tile_images, tile_annotations = [], []
+    try:
+        for tiles in results:
+            for tile, boxes, cats in tiles:
+                tile["id"] = len(tile_images) + 1
+                tile_images.append(tile)
+                for bbox, cat in zip(boxes.tolist(), cats.tolist()):
+                    tile_annotations.append({
+                        "id": len(tile_annotations) + 1,
+                        "image_id": tile["id"],
+                        "category_id": cat,
+                        "bbox": bbox,
+                        "area": bbox[2] * bbox[3],
+                        "iscrowd": 0,
+                    })
+    finally:
+        if workers != 1:
+            pool.shutdown()
+
+    coco = {"images": tile_images, "annotations": tile_annotations, "categories": categories}
+    with open(output / "annotations_tiles.json", "w", encoding="utf-8") as f:
+        json.dump(coco, f, indent=2, ensure_ascii=False, default=int)
+
+    if yolo:
+        write_yolo_labels(coco, output / "labels")
+
+    print(f"[INFO] Tuilage : {len(images_df)} images → {len(tile_images)} tuiles, "
+          f"{len(tile_annotations)} annotations → {output}")
+    return coco
+
+
+def write_yolo_labels(coco: dict, labels_dir: Path):
+    """Écrit un fichier .txt YOLO par image (classes numérotées dans l'ordre des catégories)."""
+    labels_dir.mkdir(parents=True, exist_ok=True)
+    class_index = {cat["id"]: idx for idx, cat in enumerate(coco["categories"])}
+    images = {img["id"]: img for img in coco["images"]}
+
+    lines = {img_id: [] for img_id in images}
+    for ann in coco["annotations"]:
+        img = images[ann["image_id"]]
+        x, y, w, h = ann["bbox"]
+        lines[ann["image_id"]].append(
+            f"{class_index[ann['category_id']]} {(x + w / 2) / img['width']:.6f} "
+            f"{(y + h / 2) / img['height']:.6f} {w / img['width']:.6f} {h / img['height']:.6f}\n"
+        )
+    for img_id, img in images.items():
+        with open(labels_dir / f"{Path(img['file_name']).stem}.txt", "w") as f:
+            f.writelines(lines[img_id])
+
+
+if __name__ == "__main__":
+    ## Fichiers et dossiers à adapter
+    tile_dataset(
+        coco_json_path="data/annotations_clean.json",
+        images_dir="data/images",
+        output_dir="data/dataset_tiles",
+    )
@@ -1,29 +1,205 @@
 # visualize_dataset.py
 
-import fiftyone as fo
-import fiftyone.types as fot
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import cv2
+import fiftyone as fo
+
+from prepare_data.data_loader import load_coco_annotations, coco_to_dataframes
+from prepare_data.dir_index import get_directory_index, set_index_cache_dir
+
 # --- Chemins ---
 IMAGES_DIR = Path("data/images/")                       # dossier des images
 COCO_JSON_PATH = Path("data/annotations_clean.json")    # fichier COCO JSON nettoyé
+THUMBNAILS_DIR = Path("data/thumbnails/")               # cache des miniatures
+DATASET_NAME = "IncendiesClean"                         # nom du dataset dans FiftyOne
+
+
+# =================== Empreintes des échantillons ===================
+def image_stamp(path: Path) -> str:
+    """Empreinte rapide d'un fichier image (taille + date de modification)."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def build_samples_index(coco_json_path: Path, images_dir: Path) -> dict[str, dict]:
+    """
+    Construit l'état attendu du dataset à partir du COCO nettoyé.
+    Returns :
+        dict : filepath => {"hash", "stamp", "width", "height", "detections"}
+               (les images absentes du disque sont ignorées)
+    """
+    dfs = coco_to_dataframes(load_coco_annotations(str(coco_json_path)))
+    images_df, annotations_df = dfs["images"], dfs.get("annotations")
+    names = dict(zip(dfs["categories"]["id"], dfs["categories"]["name"])) if "categories" in dfs else {}
+
+    boxes_by_image = {}
+    if annotations_df is not None and not annotations_df.empty:
+        for image_id, group in annotations_df.groupby("image_id"):
+            boxes_by_image[image_id] = sorted(
+                (names.get(cat, str(cat)), list(bbox))
+                for cat, bbox in zip(group["category_id"], group["bbox"])
+            )
+
+    files = get_directory_index(images_dir, recursive=True)
+    index = {}
+    for image_id, file_name, width, height in images_df[["id", "file_name", "width", "height"]].itertuples(index=False):
+        if not files.exists(file_name):
+            continue
+        path = (images_dir / file_name).resolve()
+        # os.stat et non l'index : une image réécrite sur place ne change pas la date de son dossier
+        try:
+            stamp = image_stamp(path)
+        except FileNotFoundError:
+            continue
+        boxes = boxes_by_image.get(image_id, [])
+        payload = json.dumps([stamp, int(width), int(height), boxes], sort_keys=True, default=float)
+        index[str(path)] = {
+            "hash": hashlib.sha1(payload.encode()).hexdigest(),
+            "stamp": stamp,
+            "width": int(width),
+            "height": int(height),
+            "detections": boxes,
+        }
+    return index
+
+
+# =================== Miniatures ===================
+def _make_thumbnail(args) -> str:
+    """Génère une miniature (hauteur fixe) si elle n'existe pas déjà dans le cache."""
+    filepath, thumb_path, height = args
+    if os.path.exists(thumb_path):
+        return thumb_path
+    img = cv2.imread(filepath, cv2.IMREAD_COLOR)
+    if img is None:
+        return filepath
+    scale = height / img.shape[0]
+    if scale < 1:
+        img = cv2.resize(img, (max(1, int(img.shape[1] * scale)), height), interpolation=cv2.INTER_AREA)
+    cv2.imwrite(thumb_path, img, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return thumb_path
+
+
+def generate_thumbnails(index: dict[str, dict], thumbnails_dir: Path, height: int = 256,
+                        workers: int = None) -> dict[str, str]:
+    """
+    Génère les miniatures en parallèle. Le nom de chaque miniature dépend de l'empreinte
+    de l'image : une miniature n'est recalculée que si l'image elle-même a changé.
+    """
+    thumbnails_dir.mkdir(parents=True, exist_ok=True)
+    tasks = []
+    for filepath, info in index.items():
+        key = hashlib.sha1(f"{filepath}:{info['stamp']}:{height}".encode()).hexdigest()
+        tasks.append((filepath, str((thumbnails_dir / f"{key}.jpg").resolve()), height))
+
+    cached = get_directory_index(thumbnails_dir).names()
+    todo = [t for t in tasks if os.path.basename(t[1]) not in cached]
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_make_thumbnail, todo, chunksize=32))
+    print(f"[INFO] Miniatures : {len(todo)} générées, {len(tasks) - len(todo)} en cache")
+    return {filepath: thumb for filepath, thumb, _ in tasks}
+
+
+# =================== Synchronisation FiftyOne ===================
+def _to_detections(info: dict) -> fo.Detections:
+    """Convertit les boîtes COCO (pixels) en détections FiftyOne (coordonnées relatives)."""
+    w, h = info["width"], info["height"]
+    return fo.Detections(detections=[
+        fo.Detection(label=label, bounding_box=[x / w, y / h, bw / w, bh / h])
+        for label, (x, y, bw, bh) in info["detections"]
+    ])
+
+
+def diff_samples(existing: dict[str, tuple], index: dict[str, dict]) -> tuple[list, dict, list]:
+    """
+    Compare le dataset existant à l'état attendu.
+    Args :
+        existing (dict) : filepath => (id de l'échantillon, sync_hash) déjà dans FiftyOne
+        index (dict) : état attendu (build_samples_index)
+    Returns :
+        tuple : chemins ajoutés, {id: chemin} modifiés, ids supprimés
+    """
+    removed = [sample_id for path, (sample_id, _) in existing.items() if path not in index]
+    changed = {sample_id: path for path, (sample_id, h) in existing.items()
+               if path in index and h != index[path]["hash"]}
+    added = [path for path in index if path not in existing]
+    return added, changed, removed
+
+
+def sync_dataset(name: str = DATASET_NAME, coco_json_path: Path = COCO_JSON_PATH,
+                 images_dir: Path = IMAGES_DIR, thumbnails_dir: Path = THUMBNAILS_DIR) -> fo.Dataset:
+    """
+    Met à jour un dataset FiftyOne persistant : seuls les échantillons ajoutés, supprimés
+    ou modifiés depuis la dernière exécution (empreinte "sync_hash") sont traités.
+    """
+    if not coco_json_path.exists():
+        raise FileNotFoundError(f"Le fichier {coco_json_path} est introuvable. Exécutez d'abord le pipeline pour générer le JSON nettoyé.")
+
+    index = build_samples_index(coco_json_path, images_dir)
+    thumbnails = generate_thumbnails(index, thumbnails_dir)
+
+    dataset = fo.load_dataset(name) if fo.dataset_exists(name) else fo.Dataset(name)
+    dataset.persistent = True
+
+    existing = {}
+    if len(dataset):
+        hashes = dataset.values("sync_hash") if dataset.has_sample_field("sync_hash") else [None] * len(dataset)
+        existing = dict(zip(dataset.values("filepath"), zip(dataset.values("id"), hashes)))
+
+    added, changed, removed = diff_samples(existing, index)
+
+    # 1️⃣ Échantillons supprimés
+    if removed:
+        dataset.delete_samples(removed)
+
+    # 2️⃣ Échantillons modifiés
+    if changed:
+        for sample in dataset.select(list(changed)).iter_samples(autosave=True):
+            info = index[changed[sample.id]]
+            sample["ground_truth"] = _to_detections(info)
+            sample["thumbnail_path"] = thumbnails[sample.filepath]
+            sample["sync_hash"] = info["hash"]
+            sample.metadata = fo.ImageMetadata(width=info["width"], height=info["height"])
+
+    # 3️⃣ Nouveaux échantillons
+    if added:
+        dataset.add_samples(
+            fo.Sample(
+                filepath=path,
+                ground_truth=_to_detections(index[path]),
+                thumbnail_path=thumbnails[path],
+                sync_hash=index[path]["hash"],
+                metadata=fo.ImageMetadata(width=index[path]["width"], height=index[path]["height"]),
+            )
+            for path in added
+        )
+
+    # Afficher les miniatures dans la grille de l'application
+    dataset.app_config.media_fields = ["filepath", "thumbnail_path"]
+    dataset.app_config.grid_media_field = "thumbnail_path"
+    dataset.save()
+
+    print(f"[INFO] Synchronisation FiftyOne : {len(added)} ajoutés, {len(changed)} modifiés, "
+          f"{len(removed)} supprimés, {len(dataset)} au total")
+    return dataset
+
+
+def main():
+    set_index_cache_dir("data/.dir_index")
+    dataset = sync_dataset()
+
+    # --- Lancer l'interface graphique pour visualiser ---
+    session = fo.launch_app(dataset, address="0.0.0.0", port=5151)
+    session.wait()  # attend la fermeture de l'application
+
+    # --- Optionnel : résumé console ---
+    print(dataset)
+
 
-# Vérifier que le fichier existe
-if not COCO_JSON_PATH.exists():
-    raise FileNotFoundError(f"Le fichier {COCO_JSON_PATH} est introuvable. Exécutez d'abord le pipeline pour générer le JSON nettoyé.")
-
-# --- Charger le dataset COCO via Dataset.from_dir() ---
-dataset = fo.Dataset.from_dir(
-    dataset_type=fot.COCODetectionDataset,
-    data_path=IMAGES_DIR,
-    labels_path=COCO_JSON_PATH,
-    name="IncendiesClean",  # nom du dataset dans FiftyOne
-    overwrite=True           # réécrit le dataset si déjà présent
-)
-
-# --- Lancer l'interface graphique pour visualiser ---
-session = fo.launch_app(dataset, address="0.0.0.0", port=5151)
-session.wait()  # attend la fermeture de l'application
-
-# --- Optionnel : résumé console ---
-print(dataset)
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import json
 import os
 import shutil
 import random
+from prepare_data.dir_index import get_directory_index
 
 # Chemins (paths):
 coco_json_path = "data/annotations_clean.json"  
@@ -65,6 +66,7 @@ val_imgs = all_images[n_train:n_train+n_val]
 test_imgs = all_images[n_train+n_val:]
 
 def move_files(img_list, split):
+    labels_index = get_directory_index(labels_dir)
     for img_file in img_list:
         base = os.path.splitext(img_file)[0]
         label_file = base + ".txt"
@@ -73,9 +75,8 @@ def move_files(img_list, split):
         shutil.copy(os.path.join(images_dir, img_file), f"dataset/{split}/images/{img_file}")
 
         # Copy labels (si existe)
-        label_path = os.path.join(labels_dir, label_file)
-        if os.path.exists(label_path):
-            shutil.copy(label_path, f"dataset/{split}/labels/{label_file}")
+        if labels_index.exists(label_file):
+            shutil.copy(os.path.join(labels_dir, label_file), f"dataset/{split}/labels/{label_file}")
 
 move_files(train_imgs, "train")
 move_files(val_imgs, "val")
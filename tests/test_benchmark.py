@@ -0,0 +1,78 @@
+# tests/test_benchmark.py
+
+import sys
+from pathlib import Path
+import pandas as pd
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/benchmark.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from modeles.benchmark import (
+    pareto_front,
+    summarize_latencies,
+    run_benchmark
+)
+
+
+class FakeModel:
+    """Modèle simulé : predict ne fait rien"""
+    def predict(self, images, **kwargs):
+        return [None] * len(images)
+
+
+# ------------------------------
+# 1/ Tests pour summarize_latencies et pareto_front
+# ------------------------------
+def test_summarize_latencies():
+    """Cas : 4 lots de 2 images à 100 ms => 20 images/s"""
+    stats = summarize_latencies([100, 100, 100, 100], batch=2)
+    assert stats["latency_p50_ms"] == 100
+    assert stats["throughput_ips"] == pytest.approx(20.0)
+
+def test_pareto_front():
+    """Cas : le modèle lent et moins précis est dominé"""
+    df = pd.DataFrame([
+        {"latency_p50_ms": 10, "map50_95": 0.30},   # rapide
+        {"latency_p50_ms": 30, "map50_95": 0.45},   # précis
+        {"latency_p50_ms": 40, "map50_95": 0.40},   # dominé
+    ])
+    assert pareto_front(df).tolist() == [True, True, False]
+
+def test_pareto_front_per_image_cost():
+    """Cas : lot de 8 plus lent par lot mais plus rapide par image => le lot de 1 est dominé"""
+    rows = [{"batch": b, **summarize_latencies([lat], batch=b), "map50_95": 0.4}
+            for b, lat in ((1, 20.0), (8, 80.0))]
+    df = pd.DataFrame(rows)
+    assert pareto_front(df, cost="latency_per_image_ms").tolist() == [False, True]
+
+
+# ------------------------------
+# 2/ Test run_benchmark (modèle simulé, sans processus séparé)
+# ------------------------------
+def test_run_benchmark_sweep(tmp_path: Path):
+    """Cas : 2 modèles x 2 tailles de lot x 2 threads => 8 lignes, export une fois par (modèle, backend, imgsz)"""
+    exports, loaded = [], []
+    def fake_export(weights, backend, imgsz):
+        exports.append((weights, backend, imgsz))
+        return f"{weights}.{backend}"
+    def fake_loader(model_path):
+        loaded.append(model_path)
+        return FakeModel()
+
+    df = run_benchmark(["a.pt", "b.pt"], imgsz=(64,), batch=(1, 2), threads=(1, 2), backends=("onnx",),
+                       maps={"a.pt": 0.3, "b.pt": 0.4}, warmup=1, iterations=3,
+                       loader=fake_loader, exporter=fake_export,
+                       output_csv=str(tmp_path / "bench.csv"))
+    assert len(df) == 8
+    assert exports == [("a.pt", "onnx", 64), ("b.pt", "onnx", 64)]
+    assert set(loaded) == {"a.pt.onnx", "b.pt.onnx"}
+    assert set(df["map50_95"]) == {0.3, 0.4}
+    assert {"latency_p99_ms", "throughput_ips", "peak_rss_mb", "pareto"} <= set(df.columns)
+    assert (tmp_path / "bench.csv").exists()
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
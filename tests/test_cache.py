@@ -0,0 +1,85 @@
+# tests/test_cache.py
+
+import sys
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/cache.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+import modeles.cache as cache_module
+from modeles.cache import (
+    PredictionCache,
+    make_key,
+    predict_with_cache
+)
+
+
+# ------------------------------
+# 1/ Tests pour PredictionCache
+# * Lecture / écriture et statistiques
+# * Éviction des entrées les moins récemment utilisées
+# ------------------------------
+def test_cache_get_put(tmp_path: Path):
+    """Cas : échec puis succès sur la même clé"""
+    det = np.array([[1, 2, 3, 4, 0.5, 0]], dtype=np.float32)
+    with PredictionCache(str(tmp_path / "cache.sqlite")) as cache:
+        assert cache.get("a") is None
+        cache.put("a", det)
+        np.testing.assert_array_equal(cache.get("a"), det)
+        stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_cache_eviction_lru(tmp_path: Path):
+    """Cas : taille maximale dépassée => l'entrée la plus ancienne est supprimée"""
+    det = np.zeros((10, 6), dtype=np.float32)  # 240 octets + clé
+    with PredictionCache(str(tmp_path / "cache.sqlite"), max_bytes=600) as cache:
+        cache.put("a", det)
+        cache.put("b", det)
+        cache.get("a")  # "a" devient la plus récente
+        cache.put("c", det)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+def test_make_key_depends_on_settings():
+    """Cas : mêmes image et poids, paramètres différents => clés différentes"""
+    assert make_key("img", "w", 512, 0.25, "pytorch") != make_key("img", "w", 640, 0.25, "pytorch")
+    assert make_key("img", "w", 512, 0.25, "pytorch") == make_key("img", "w", 512, 0.25, "pytorch")
+
+
+# ------------------------------
+# 2/ Test predict_with_cache (détecteur simulé)
+# ------------------------------
+def test_predict_with_cache_only_new_images(tmp_path: Path, monkeypatch):
+    """Cas : second passage => seule la nouvelle image est recalculée"""
+    weights = tmp_path / "best.pt"
+    weights.write_bytes(b"poids")
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"img{i}.png"
+        cv2.imwrite(str(path), np.full((8, 8, 3), i * 40, dtype=np.uint8))
+        paths.append(str(path))
+
+    computed = []
+    def fake_predict(model, images, **kwargs):
+        computed.extend(images)
+        return [np.array([[0, 0, 1, 1, 0.9, 0]], dtype=np.float32) for _ in images]
+    monkeypatch.setattr(cache_module, "predict_detections", fake_predict)
+
+    with PredictionCache(str(tmp_path / "cache.sqlite")) as cache:
+        predict_with_cache(None, str(weights), paths[:2], cache)
+        assert len(computed) == 2
+        results = predict_with_cache(None, str(weights), paths, cache)
+        assert len(computed) == 3
+        assert len(results) == 3
+        assert cache.stats()["hits"] == 2
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,89 @@
+# tests/test_cascade.py
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/cascade.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+import modeles.cascade as cascade
+from modeles.cascade import (
+    threshold_curve,
+    calibrate_threshold,
+    cascade_predict
+)
+
+
+# ------------------------------
+# 1/ Tests pour threshold_curve et calibrate_threshold
+# ------------------------------
+def test_threshold_curve_weighted_recall():
+    """Cas : le positif à 3 boîtes pèse plus que celui à 1 boîte"""
+    curve = threshold_curve([0.9, 0.2, 0.1], [True, True, False], weights=[3, 1, 0],
+                            thresholds=np.array([0.0, 0.5]))
+    assert curve["recall"].tolist() == [1.0, 0.75]
+    assert curve["pass_rate"].tolist() == pytest.approx([1.0, 1 / 3])
+
+def test_calibrate_threshold_no_recall_loss():
+    """Cas : perte de rappel nulle => seuil le plus haut gardant tous les positifs"""
+    scores = np.array([0.95, 0.6, 0.3, 0.05, 0.02, 0.01])
+    positives = np.array([True, True, False, False, False, False])
+    result = calibrate_threshold(scores, positives, max_recall_loss=0.0)
+    assert result["threshold"] == pytest.approx(0.6)
+    assert result["recall_loss"] == 0.0
+    assert result["pass_rate"] == pytest.approx(2 / 6)
+    assert result["expected_speedup"] == pytest.approx(3.0)
+
+
+# ------------------------------
+# 2/ Test cascade_predict (classifieur et détecteur simulés)
+# ------------------------------
+def test_cascade_predict_gates_negatives(monkeypatch):
+    """Cas : seules les tuiles au-dessus du seuil passent par le détecteur"""
+    images = [np.full((8, 8, 3), v, dtype=np.uint8) for v in (0, 200, 10, 255)]
+    monkeypatch.setattr(cascade, "predict_fire_scores",
+                        lambda classifier, imgs, **kw: np.array([img.mean() / 255 for img in imgs]))
+    seen = []
+    def fake_detect(detector, imgs, **kwargs):
+        seen.extend(imgs)
+        return [np.array([[0, 0, 1, 1, 0.9, 0]], dtype=np.float32) for _ in imgs]
+    monkeypatch.setattr(cascade, "predict_detections", fake_detect)
+
+    detections, stats = cascade_predict(None, None, images, threshold=0.5, batch=3)
+    assert [len(d) for d in detections] == [0, 1, 0, 1]
+    assert len(seen) == 2
+    assert stats["pass_rate"] == 0.5
+
+
+# ------------------------------
+# 3/ Test calibrate_on_split (images lues via la colonne path du manifeste)
+# ------------------------------
+def test_calibrate_on_split_reads_manifest_paths(tmp_path: Path, monkeypatch):
+    """Cas : chaque ligne du manifeste est lue depuis son chemin réel (aucune image None)"""
+    import cv2
+    rows = []
+    for i, (label, n_boxes) in enumerate([("fire", 2), ("fire", 1), ("no_fire", 0)]):
+        rel = f"val/{label}/x_{i}.png"
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(tmp_path / rel), np.full((4, 4, 3), 255 if label == "fire" else 0, dtype=np.uint8))
+        rows.append({"split": "val", "file_name": "x.png", "label": label, "n_boxes": n_boxes, "path": rel})
+    pd.DataFrame(rows).to_csv(tmp_path / "manifest.csv", index=False)
+
+    def fake_scores(classifier, images, **kwargs):
+        assert all(img is not None for img in images)
+        return np.array([img.mean() / 255 for img in images], dtype=np.float32)
+    monkeypatch.setattr(cascade, "predict_fire_scores", fake_scores)
+
+    result = cascade.calibrate_on_split(None, data_dir=str(tmp_path), max_recall_loss=0.0)
+    assert result["recall_loss"] == 0.0
+    assert result["pass_rate"] == pytest.approx(2 / 3)
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
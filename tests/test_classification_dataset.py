@@ -0,0 +1,66 @@
+# tests/test_classification_dataset.py
+
+import sys
+import json
+from pathlib import Path
+import pandas as pd
+import pytest
+
+# --- le dossier parent pour que Python trouve classification_dataset.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.classification_dataset import build_classification_dataset
+
+
+def make_coco(tmp_path: Path) -> tuple[str, str]:
+    """4 images : 2 annotées (dont 2 avec le même nom de base), 2 sans annotation, 1 absente du disque."""
+    images_dir = tmp_path / "images"
+    for name in ("a/x.jpg", "b/x.jpg", "neg1.jpg", "neg2.jpg"):
+        (images_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (images_dir / name).write_bytes(name.encode())
+    coco = {
+        "images": [{"id": i, "file_name": name} for i, name in
+                   enumerate(["a/x.jpg", "b/x.jpg", "neg1.jpg", "neg2.jpg", "absente.jpg"], start=1)],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 1, "bbox": [0, 0, 1, 1]},
+            {"id": 2, "image_id": 1, "category_id": 1, "bbox": [1, 1, 1, 1]},
+            {"id": 3, "image_id": 2, "category_id": 1, "bbox": [0, 0, 1, 1]},
+            {"id": 4, "image_id": 5, "category_id": 1, "bbox": [0, 0, 1, 1]},
+        ],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    coco_path = tmp_path / "coco.json"
+    coco_path.write_text(json.dumps(coco))
+    return str(coco_path), str(images_dir)
+
+
+# ------------------------------
+# Tests pour build_classification_dataset
+# * Labels et nombre de boîtes
+# * Image absente du disque => écartée du manifeste
+# * Même nom de base => suffixé, chaque ligne pointe vers sa propre image
+# ------------------------------
+def test_build_classification_dataset(tmp_path: Path):
+    """Cas : manifeste cohérent avec les fichiers réellement copiés"""
+    coco_path, images_dir = make_coco(tmp_path)
+    out = tmp_path / "cls"
+    manifest = build_classification_dataset(coco_path, images_dir, str(out), val_size=0.5)
+
+    assert "absente.jpg" not in set(manifest["file_name"])
+    assert len(manifest) == 4
+    labels = dict(zip(manifest["file_name"], manifest["label"]))
+    assert labels == {"a/x.jpg": "fire", "b/x.jpg": "fire", "neg1.jpg": "no_fire", "neg2.jpg": "no_fire"}
+    assert dict(zip(manifest["file_name"], manifest["n_boxes"]))["a/x.jpg"] == 2
+
+    assert manifest["path"].is_unique
+    for name, rel in zip(manifest["file_name"], manifest["path"]):
+        assert (out / rel).read_bytes() == name.encode()
+    saved = pd.read_csv(out / "manifest.csv")
+    assert saved["path"].tolist() == manifest["path"].tolist()
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,156 @@
+# tests/test_coco_merge.py
+
+import sys
+import json
+from pathlib import Path
+import pytest
+
+# --- le dossier parent pour que Python trouve coco_merge.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.coco_merge import merge_coco_files
+from prepare_data.data_loader import load_coco_annotations
+
+
+def write_source(folder: Path, images: dict, coco: dict) -> tuple:
+    """Crée un export COCO et son dossier d'images (nom => contenu)."""
+    images_dir = folder / "images"
+    images_dir.mkdir(parents=True)
+    for name, content in images.items():
+        (images_dir / name).write_bytes(content)
+    annotations_file = folder / "coco.json"
+    annotations_file.write_text(json.dumps(coco))
+    return str(annotations_file), str(images_dir)
+
+
+# ------------------------------
+# 1/ Tests pour merge_coco_files
+# * ids en collision => renumérotés
+# * catégories unifiées par nom
+# * image identique => dédoublonnée
+# * même nom, contenu différent => renommée
+# ------------------------------
+def test_merge_coco_files(tmp_path: Path):
+    """Cas : deux fournisseurs avec ids, catégories et noms en collision"""
+    source_a = write_source(tmp_path / "a", {"img1.jpg": b"AAA", "img2.jpg": b"BBB"}, {
+        "images": [{"id": 1, "file_name": "img1.jpg"}, {"id": 2, "file_name": "img2.jpg"}],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 0, "bbox": [0, 0, 5, 5]},
+            {"id": 2, "image_id": 2, "category_id": 0, "bbox": [1, 1, 5, 5]},
+        ],
+        "categories": [{"id": 0, "name": "fire"}],
+    })
+    source_b = write_source(tmp_path / "b", {"copy.jpg": b"AAA", "img2.jpg": b"CCC"}, {
+        "images": [{"id": 1, "file_name": "copy.jpg"}, {"id": 2, "file_name": "img2.jpg"}],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 5, "bbox": [0, 0, 5, 5]},
+            {"id": 2, "image_id": 2, "category_id": 7, "bbox": [2, 2, 5, 5]},
+        ],
+        "categories": [{"id": 5, "name": "Fire"}, {"id": 7, "name": "wildfire"}],
+    })
+
+    output = tmp_path / "merged.json"
+    stats = merge_coco_files([source_a, source_b], str(output), output_images_dir=str(tmp_path / "out"))
+    merged = load_coco_annotations(str(output))
+
+    assert [img["file_name"] for img in merged["images"]] == ["img1.jpg", "img2.jpg", "img2_1.jpg"]
+    assert [img["id"] for img in merged["images"]] == [1, 2, 3]
+    assert [a["id"] for a in merged["annotations"]] == [1, 2, 3]
+    assert [c["name"] for c in merged["categories"]] == ["fire", "wildfire"]
+    # l'annotation de la copie est ignorée, celle de img2 (fournisseur b) pointe vers l'image 3 / wildfire
+    assert merged["annotations"][2]["image_id"] == 3
+    assert merged["annotations"][2]["category_id"] == 2
+    assert (stats["duplicates"], stats["renamed"]) == (1, 1)
+    assert (tmp_path / "out" / "img2_1.jpg").read_bytes() == b"CCC"
+
+def test_merge_without_images_dir(tmp_path: Path):
+    """Cas : sans dossier d'images => même nom, images différentes : renommée, annotations gardées"""
+    coco_a = {
+        "images": [{"id": 3, "file_name": "img.jpg", "width": 10, "height": 10}],
+        "annotations": [{"id": 9, "image_id": 3, "category_id": 1, "bbox": [0, 0, 1, 1]}],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    coco_b = {**coco_a, "images": [{"id": 3, "file_name": "img.jpg", "width": 20, "height": 20}]}
+    (tmp_path / "a.json").write_text(json.dumps(coco_a))
+    (tmp_path / "b.json").write_text(json.dumps(coco_b))
+    output = tmp_path / "merged.json"
+    stats = merge_coco_files([(str(tmp_path / "a.json"), None), (str(tmp_path / "b.json"), None)],
+                             str(output))
+    merged = load_coco_annotations(str(output))
+    assert [(img["file_name"], img["width"]) for img in merged["images"]] == [("img.jpg", 10), ("img_1.jpg", 20)]
+    assert [a["image_id"] for a in merged["annotations"]] == [1, 2]
+    assert (stats["duplicates"], stats["renamed"]) == (0, 1)
+
+def test_merge_heterogeneous_records_valid_json(tmp_path: Path):
+    """Cas : champs présents sur certains enregistrements seulement => pas de NaN, entiers conservés"""
+    coco = {
+        "images": [{"id": 1, "file_name": "a.jpg", "license": 1}, {"id": 2, "file_name": "b.jpg"}],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 1, "bbox": [0, 0, 1, 1], "segmentation": [[0, 0, 1, 1]]},
+            {"id": 2, "image_id": 2, "category_id": 1, "bbox": [0, 0, 1, 1]},
+        ],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    (tmp_path / "a.json").write_text(json.dumps(coco))
+    output = tmp_path / "merged.json"
+    merge_coco_files([(str(tmp_path / "a.json"), None)], str(output))
+    text = output.read_text()
+    assert "NaN" not in text
+    merged = json.loads(text)
+    assert merged["images"][0]["license"] == 1 and isinstance(merged["images"][0]["license"], int)
+    assert "license" not in merged["images"][1]
+    assert "segmentation" not in merged["annotations"][1]
+
+def test_merge_renamed_name_already_taken(tmp_path: Path):
+    """Cas : a = {x.jpg, x_1.jpg}, b = {x.jpg} => b renommé en x_1_1.jpg, aucune image perdue"""
+    source_a = write_source(tmp_path / "a", {"x.jpg": b"AAA", "x_1.jpg": b"BBB"}, {
+        "images": [{"id": 1, "file_name": "x.jpg"}, {"id": 2, "file_name": "x_1.jpg"}],
+        "annotations": [],
+        "categories": [{"id": 1, "name": "fire"}],
+    })
+    source_b = write_source(tmp_path / "b", {"x.jpg": b"CCC"}, {
+        "images": [{"id": 1, "file_name": "x.jpg"}],
+        "annotations": [{"id": 1, "image_id": 1, "category_id": 1, "bbox": [0, 0, 1, 1]}],
+        "categories": [{"id": 1, "name": "fire"}],
+    })
+    output = tmp_path / "merged.json"
+    merge_coco_files([source_a, source_b], str(output), output_images_dir=str(tmp_path / "out"))
+    merged = load_coco_annotations(str(output))
+    names = [img["file_name"] for img in merged["images"]]
+    assert names == ["x.jpg", "x_1.jpg", "x_1_1.jpg"]
+    assert merged["annotations"][0]["image_id"] == 3
+    assert (tmp_path / "out" / "x_1_1.jpg").read_bytes() == b"CCC"
+
+def test_merge_skips_missing_images(tmp_path: Path):
+    """Cas : image listée mais absente du disque => ignorée avec ses annotations, pas d'exception"""
+    source = write_source(tmp_path / "a", {"ok.jpg": b"AAA"}, {
+        "images": [{"id": 1, "file_name": "ok.jpg"}, {"id": 2, "file_name": "absente.jpg"}],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 1, "bbox": [0, 0, 1, 1]},
+            {"id": 2, "image_id": 2, "category_id": 1, "bbox": [0, 0, 1, 1]},
+        ],
+        "categories": [{"id": 1, "name": "fire"}],
+    })
+    output = tmp_path / "merged.json"
+    stats = merge_coco_files([source], str(output), output_images_dir=str(tmp_path / "out"),
+                             keep_duplicate_annotations=True)
+    merged = load_coco_annotations(str(output))
+    assert [img["file_name"] for img in merged["images"]] == ["ok.jpg"]
+    assert len(merged["annotations"]) == 1
+    assert (stats["missing"], stats["duplicates"]) == (1, 0)
+
+def test_merge_failure_keeps_previous_output(tmp_path: Path):
+    """Cas : erreur pendant la fusion => l'ancien fichier de sortie reste intact"""
+    output = tmp_path / "merged.json"
+    output.write_text('{"images": []}')
+    with pytest.raises(FileNotFoundError):
+        merge_coco_files([(str(tmp_path / "inexistant.json"), None)], str(output))
+    assert output.read_text() == '{"images": []}'
+    assert not (tmp_path / "merged.json.tmp").exists()
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
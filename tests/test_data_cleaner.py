@@ -13,7 +13,9 @@ from prepare_data.data_cleaner import (
     check_images_consistency,
     images_without_annotations,
     annotations_without_images,
-    detect_abnormal_annotations
+    detect_abnormal_annotations,
+    fix_bbox,
+    fix_bboxes
 )
 
 
@@ -82,6 +84,25 @@ def test_check_images_consistency_extra_file(tmp_path: Path):
     assert stats["missing_count"] == 0
     assert stats["unreferenced_count"] == 1
 
+def test_check_images_consistency_reuses_saved_index(tmp_path: Path, monkeypatch):
+    """Cas : nouveau processus (cache mémoire vide) => index relu sur disque, aucun dossier relisté"""
+    import prepare_data.dir_index as dir_index
+    monkeypatch.setattr(dir_index, "INDEX_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(dir_index, "_INDEXES", {})
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "img1.jpg").touch()
+    images_df = pd.DataFrame([{"id": 1, "file_name": "img1.jpg"}])
+
+    check_images_consistency(images_df, str(images))
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+    monkeypatch.setattr(dir_index, "_INDEXES", {})
+    stats = check_images_consistency(images_df, str(images))
+    assert stats["missing_count"] == 0
+    (index,) = dir_index._INDEXES.values()
+    assert index.last_rescanned == 0
+
 
 # ------------------------------
 # 3/ Tests pour images_without_annotations: 
@@ -162,6 +183,17 @@ def test_detect_abnormal_annotations_all_valid():
     result = detect_abnormal_annotations(annotations_df)
     assert result.empty
 
+# ------------------------------
+# 6/ Tests pour fix_bboxes:
+# * Vérifie que la version vectorisée donne le même résultat que fix_bbox
+# ------------------------------
+def test_fix_bboxes_matches_fix_bbox():
+    """Cas : boxes valides, négatives et hors image"""
+    bboxes = [[10, 10, 20, 20], [-5, -5, 10, 10], [90, 95, 30, 30], [120, 10, 5, 5]]
+    result = fix_bboxes(bboxes, 100, 100)
+    expected = [fix_bbox({"bbox": b}, 100, 100) for b in bboxes]
+    assert result.tolist() == expected
+
 # ------------------------------
 #  pytest : cmd terminal
 # ------------------------------
@@ -0,0 +1,69 @@
+# tests/test_dir_index.py
+
+import sys
+import json
+from pathlib import Path
+import pytest
+
+# --- le dossier parent pour que Python trouve dir_index.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.dir_index import DirectoryIndex, get_directory_index
+
+
+# ------------------------------
+# 1/ Tests pour DirectoryIndex
+# * Noms, tailles et existence des fichiers
+# * Parcours récursif
+# * Rafraîchissement incrémental et index persistant
+# ------------------------------
+def test_directory_index_basic(tmp_path: Path):
+    """Cas : fichiers à la racine, sous-dossier ignoré sans récursivité"""
+    (tmp_path / "a.jpg").write_bytes(b"12345")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.jpg").touch()
+    index = DirectoryIndex(tmp_path)
+    assert index.names() == {"a.jpg"}
+    assert index.stat("a.jpg")[0] == 5
+    assert not index.exists("sub/b.jpg")
+
+def test_directory_index_recursive(tmp_path: Path):
+    """Cas : parcours récursif des sous-dossiers"""
+    (tmp_path / "sub" / "deep").mkdir(parents=True)
+    (tmp_path / "sub" / "deep" / "c.png").touch()
+    index = DirectoryIndex(tmp_path, recursive=True)
+    assert index.exists("sub/deep/c.png")
+    assert [path for path, _, _ in index.iter_files()] == ["sub/deep/c.png"]
+
+def test_directory_index_refresh(tmp_path: Path):
+    """Cas : ajout d'un fichier => seul le dossier modifié est relisté"""
+    (tmp_path / "sub").mkdir()
+    index = DirectoryIndex(tmp_path, recursive=True)
+    (tmp_path / "sub" / "new.jpg").touch()
+    assert index.refresh() == 1
+    assert index.exists("sub/new.jpg")
+    assert index.refresh() == 0
+
+def test_directory_index_persisted(tmp_path: Path):
+    """Cas : index sauvegardé => aucun dossier relisté au rechargement"""
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "a.jpg").touch()
+    index_file = tmp_path / "index.json"
+    DirectoryIndex(images, index_file=str(index_file)).save()
+    assert json.loads(index_file.read_text())["dirs"][""]["files"]["a.jpg"][0] == 0
+    reloaded = DirectoryIndex(images, index_file=str(index_file))
+    assert reloaded.last_rescanned == 0
+    assert reloaded.names() == {"a.jpg"}
+
+def test_get_directory_index_invalid_path():
+    """Cas : chemin inexistant => doit lever une FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        get_directory_index("chemin/inexistant")
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
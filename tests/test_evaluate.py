@@ -0,0 +1,93 @@
+# tests/test_evaluate.py
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/evaluate.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from modeles.evaluate import (
+    box_iou,
+    evaluate_predictions,
+    save_predictions_jsonl,
+    load_predictions_jsonl
+)
+
+CATEGORIES = pd.DataFrame([{"id": 1, "name": "wildfire"}, {"id": 2, "name": "fire"}])
+IMAGES = pd.DataFrame([
+    {"id": 1, "file_name": "img1.jpg", "width": 100, "height": 100},
+    {"id": 2, "file_name": "img2.jpg", "width": 100, "height": 100},
+])
+ANNOTATIONS = pd.DataFrame([
+    {"id": 10, "image_id": 1, "category_id": 1, "bbox": [10, 10, 20, 20]},
+    {"id": 11, "image_id": 2, "category_id": 2, "bbox": [50, 50, 30, 30]},
+])
+
+
+# ------------------------------
+# 1/ Tests pour box_iou
+# ------------------------------
+def test_box_iou_basic():
+    """Cas : boîte identique, demi-recouvrement, disjointe"""
+    iou = box_iou(np.array([[0, 0, 10, 10]]), np.array([[0, 0, 10, 10], [5, 0, 10, 10], [50, 50, 5, 5]]))
+    np.testing.assert_allclose(iou, [[1.0, 1 / 3, 0.0]])
+
+
+# ------------------------------
+# 2/ Tests pour evaluate_predictions
+# * Prédictions parfaites => mAP = 1
+# * Une erreur de classe => matrice de confusion
+# * Seuil de confiance appliqué sans relancer le modèle
+# ------------------------------
+def test_evaluate_perfect_predictions():
+    """Cas : prédictions identiques à la vérité terrain"""
+    preds = ANNOTATIONS[["image_id", "category_id", "bbox"]].assign(score=0.9)
+    metrics = evaluate_predictions(IMAGES, ANNOTATIONS, CATEGORIES, preds, workers=1)
+    assert metrics["map50"] == pytest.approx(1.0)
+    assert metrics["map50_95"] == pytest.approx(1.0)
+    np.testing.assert_array_equal(metrics["confusion_matrix"], [[1, 0, 0], [0, 1, 0], [0, 0, 0]])
+
+def test_evaluate_wrong_class():
+    """Cas : bonne boîte mais mauvaise classe => AP nulle et confusion wildfire/fire"""
+    preds = pd.DataFrame([
+        {"image_id": 1, "category_id": 2, "bbox": [10, 10, 20, 20], "score": 0.8},
+    ])
+    metrics = evaluate_predictions(IMAGES, ANNOTATIONS, CATEGORIES, preds, workers=1)
+    assert metrics["map50"] == 0.0
+    assert metrics["confusion_matrix"][1, 0] == 1  # prédit fire, vérité wildfire
+    assert metrics["confusion_matrix"][2, 1] == 1  # fire non détecté
+
+def test_evaluate_conf_threshold():
+    """Cas : un faux positif très confiant, filtré par le seuil"""
+    preds = pd.DataFrame([
+        {"image_id": 1, "category_id": 1, "bbox": [60, 60, 20, 20], "score": 0.2},
+        {"image_id": 1, "category_id": 1, "bbox": [10, 10, 20, 20], "score": 0.1},
+    ])
+    low = evaluate_predictions(IMAGES, ANNOTATIONS, CATEGORIES, preds, conf=0.0, workers=1)
+    high = evaluate_predictions(IMAGES, ANNOTATIONS, CATEGORIES, preds, conf=0.15, workers=1)
+    wildfire_low = low["per_class"].set_index("name").loc["wildfire"]
+    wildfire_high = high["per_class"].set_index("name").loc["wildfire"]
+    assert wildfire_low["ap50"] == pytest.approx(0.5, abs=0.01)
+    assert wildfire_high["ap50"] == 0.0
+    assert wildfire_high["n_pred"] == 1
+
+
+# ------------------------------
+# 3/ Tests pour les prédictions JSONL
+# ------------------------------
+def test_predictions_jsonl_file_name(tmp_path: Path):
+    """Cas : prédictions référencées par file_name => converties en image_id"""
+    path = tmp_path / "preds.jsonl"
+    save_predictions_jsonl([{"file_name": "img2.jpg", "category_id": 2, "bbox": [50, 50, 30, 30], "score": 0.7}], str(path))
+    preds = load_predictions_jsonl(str(path), IMAGES)
+    assert preds["image_id"].tolist() == [2]
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
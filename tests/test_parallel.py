@@ -0,0 +1,110 @@
+# tests/test_parallel.py
+
+import os
+import sys
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/parallel.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from modeles.parallel import available_cpus, run_parallel_inference
+
+
+# ------------------------------
+# Modèle simulé (au niveau du module : transmis aux processus fils)
+# ------------------------------
+class _Array:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float32)
+    def cpu(self):
+        return self
+    def numpy(self):
+        return self.values
+
+class _Boxes:
+    def __init__(self, img):
+        h, w = img.shape[:2]
+        self.xyxy = _Array([[0, 0, w, h]])
+        self.conf = _Array([img.mean() / 255])
+        self.cls = _Array([0])
+    def __len__(self):
+        return 1
+
+class _Result:
+    def __init__(self, img):
+        self.boxes = _Boxes(img)
+
+class FakeModel:
+    def predict(self, images, **kwargs):
+        return [_Result(img) for img in images]
+
+def fake_loader(weights):
+    return FakeModel()
+
+class SlowModel(FakeModel):
+    """Modèle simulé lent : 30 ms par image (sommeil, ne consomme pas de CPU)"""
+    def predict(self, images, **kwargs):
+        time.sleep(0.03 * len(images))
+        return super().predict(images, **kwargs)
+
+def slow_loader(weights):
+    return SlowModel()
+
+
+# ------------------------------
+# Test run_parallel_inference
+# ------------------------------
+def test_parallel_inference_ordered_and_rescaled(tmp_path):
+    """Cas : sorties dans l'ordre d'entrée, boîtes remises à l'échelle d'origine"""
+    paths, sizes = [], [(40, 60), (100, 30), (200, 100), (64, 64), (10, 20)]
+    for i, (h, w) in enumerate(sizes):
+        path = tmp_path / f"img_{i}.png"
+        cv2.imwrite(str(path), np.full((h, w, 3), 20 * i + 10, dtype=np.uint8))
+        paths.append(str(path))
+
+    detections, stats = run_parallel_inference("fake.pt", paths, workers=2, batch=2, slots=2,
+                                               imgsz=64, pin_cores=False, loader=fake_loader)
+    assert stats["images"] == len(paths)
+    for i, ((h, w), det) in enumerate(zip(sizes, detections)):
+        assert det.shape == (1, 6)
+        assert det[0, 2:4] == pytest.approx([w, h], rel=0.05)
+        assert det[0, 4] == pytest.approx((20 * i + 10) / 255, abs=0.01)
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="nécessite sched_setaffinity")
+def test_parallel_inference_restricted_cpu_set(tmp_path):
+    """Cas : processus limité au dernier cœur => workers épinglés sur les cœurs autorisés"""
+    path = tmp_path / "img.png"
+    cv2.imwrite(str(path), np.full((16, 16, 3), 100, dtype=np.uint8))
+    allowed = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, {max(allowed)})
+    try:
+        assert available_cpus() == [max(allowed)]
+        detections, _ = run_parallel_inference("fake.pt", [str(path)] * 3, workers=2, batch=1,
+                                               imgsz=16, loader=fake_loader)
+    finally:
+        os.sched_setaffinity(0, allowed)
+    assert [len(d) for d in detections] == [1, 1, 1]
+
+def test_parallel_inference_scales_with_workers(tmp_path):
+    """Cas : modèle lent (30 ms / image), 4 processus => débit hors chargement au moins 2.5x celui d'un seul"""
+    path = tmp_path / "img.png"
+    cv2.imwrite(str(path), np.full((32, 32, 3), 100, dtype=np.uint8))
+    paths = [str(path)] * 48
+
+    _, single = run_parallel_inference("fake.pt", paths, workers=1, batch=4, imgsz=32,
+                                       pin_cores=False, loader=slow_loader)
+    _, multi = run_parallel_inference("fake.pt", paths, workers=4, batch=4, imgsz=32,
+                                      pin_cores=False, loader=slow_loader)
+    assert single["steady_ips"] < 1 / 0.03 * 1.1    # un seul processus : borné par le modèle
+    assert multi["steady_ips"] >= 2.5 * single["steady_ips"]
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,59 @@
+# tests/test_raster_inference.py
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+import tifffile
+
+# --- le dossier parent pour que Python trouve modeles/raster_inference.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+import modeles.raster_inference as raster_inference
+from modeles.raster_inference import _core_bounds, detect_raster
+from prepare_data.raster_reader import iter_windows
+
+
+# ------------------------------
+# 1/ Test _core_bounds : les cœurs partitionnent l'axe
+# ------------------------------
+def test_core_bounds_partition_with_shifted_last_window():
+    """Cas : dernière fenêtre recalée sur le bord (recouvrement réel > overlap)"""
+    starts = [x for x, _, _, _ in iter_windows(1000, 100, size=512, overlap=64)]
+    assert starts == [0, 448, 488]
+    bounds = _core_bounds(starts, 512, 1000)
+    cores = [bounds[s] for s in sorted(bounds)]
+    assert cores[0][0] == 0 and cores[-1][1] == 1000
+    for (_, hi), (lo, _) in zip(cores, cores[1:]):
+        assert hi == lo
+
+
+# ------------------------------
+# 2/ Test detect_raster : pas de doublon dans les recouvrements
+# ------------------------------
+def test_detect_raster_no_duplicates(tmp_path: Path, monkeypatch):
+    """Cas : un objet vu par deux fenêtres (recouvrement élargi) n'est gardé qu'une fois"""
+    path = tmp_path / "scene.tif"
+    tifffile.imwrite(path, np.zeros((100, 1000, 3), dtype=np.uint8), photometric="rgb")
+    offsets = iter([x for x, _, _, _ in iter_windows(1000, 100, size=512, overlap=64)])
+
+    def fake_predict(model, images, **kwargs):
+        # objet centré en x = 700 (scène), visible dans les deux dernières fenêtres
+        dets = []
+        for x in (next(offsets) for _ in images):
+            box = [[695 - x, 10, 705 - x, 20, 0.9, 0]] if x + 512 > 705 else []
+            dets.append(np.array(box, dtype=np.float32).reshape(-1, 6))
+        return dets
+    monkeypatch.setattr(raster_inference, "predict_detections", fake_predict)
+
+    detections, geo_boxes = detect_raster(None, str(path), size=512, overlap=64, batch=1)
+    assert len(detections) == 1
+    assert detections[0, 0] == pytest.approx(695)
+    assert geo_boxes.shape == (1, 4)
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
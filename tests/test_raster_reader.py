@@ -0,0 +1,117 @@
+# tests/test_raster_reader.py
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+import tifffile
+
+# --- le dossier parent pour que Python trouve raster_reader.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.raster_reader import (
+    WindowedTiffReader,
+    iter_windows,
+    to_rgb_uint8,
+    boxes_to_geo
+)
+
+
+def make_scene(height=300, width=200, bands=4):
+    return (np.arange(height * width * bands) % 60000).astype(np.uint16).reshape(height, width, bands)
+
+
+# ------------------------------
+# 1/ Tests pour WindowedTiffReader.read_window
+# * TIFF tuilé (bandes entrelacées)
+# * TIFF en strips compressés, bandes séparées
+# ------------------------------
+def test_read_window_tiled(tmp_path: Path):
+    """Cas : fenêtre à cheval sur plusieurs tuiles et sur le bord"""
+    scene = make_scene()
+    path = tmp_path / "tiled.tif"
+    tifffile.imwrite(path, scene, tile=(64, 64), photometric="minisblack", planarconfig="contig")
+    with WindowedTiffReader(str(path)) as reader:
+        assert (reader.width, reader.height, reader.samples) == (200, 300, 4)
+        window = reader.read_window(50, 250, 100, 100)
+    np.testing.assert_array_equal(window, scene[250:300, 50:150])
+
+def test_read_window_strips_separate(tmp_path: Path):
+    """Cas : strips compressés, une bande par plan"""
+    scene = make_scene()
+    path = tmp_path / "strips.tif"
+    tifffile.imwrite(path, np.moveaxis(scene, -1, 0), rowsperstrip=37,
+                     photometric="minisblack", planarconfig="separate", compression="zlib")
+    with WindowedTiffReader(str(path)) as reader:
+        window = reader.read_window(10, 30, 64, 80)
+    np.testing.assert_array_equal(window, scene[30:110, 10:74])
+
+def test_read_window_single_strip_uncompressed(tmp_path: Path):
+    """Cas : un seul strip non compressé (big-endian) => lecture directe dans le mmap"""
+    scene = make_scene()
+    path = tmp_path / "single_strip.tif"
+    tifffile.imwrite(path, scene, photometric="minisblack", planarconfig="contig", byteorder=">")
+    with WindowedTiffReader(str(path)) as reader:
+        assert reader._uncompressed and reader._down == 1
+        window = reader.read_window(120, 200, 64, 64)
+    np.testing.assert_array_equal(window, scene[200:264, 120:184])
+
+def test_reader_rejects_huge_compressed_strip(tmp_path: Path, monkeypatch):
+    """Cas : strip compressé plus grand que la limite => ValueError"""
+    import prepare_data.raster_reader as raster_reader
+    monkeypatch.setattr(raster_reader, "MAX_COMPRESSED_STRIP_PIXELS", 1000)
+    path = tmp_path / "big_strip.tif"
+    tifffile.imwrite(path, make_scene(), rowsperstrip=300, photometric="minisblack",
+                     planarconfig="contig", compression="zlib")
+    with pytest.raises(ValueError):
+        WindowedTiffReader(str(path))
+
+def test_reader_missing_file():
+    """Cas : fichier inexistant => FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        WindowedTiffReader("chemin/inexistant.tif")
+
+
+# ------------------------------
+# 2/ Tests pour le géoréférencement
+# ------------------------------
+def test_geotransform_and_boxes(tmp_path: Path):
+    """Cas : tags pixel scale + tiepoint => boîte géographique"""
+    path = tmp_path / "geo.tif"
+    tifffile.imwrite(path, make_scene(), tile=(64, 64), photometric="minisblack", planarconfig="contig", extratags=[
+        (33550, "d", 3, (10.0, 10.0, 0.0), False),
+        (33922, "d", 6, (0.0, 0.0, 0.0, 500000.0, 4800000.0, 0.0), False),
+    ])
+    with WindowedTiffReader(str(path)) as reader:
+        gt = reader.geotransform
+    assert gt == (500000.0, 10.0, 0.0, 4800000.0, 0.0, -10.0)
+    geo = boxes_to_geo(np.array([[0, 0, 10, 20]]), gt)
+    np.testing.assert_allclose(geo, [[500000.0, 4799800.0, 500100.0, 4800000.0]])
+
+
+# ------------------------------
+# 3/ Tests pour iter_windows et to_rgb_uint8
+# ------------------------------
+def test_iter_windows_covers_image():
+    """Cas : toutes les fenêtres ont la même taille et couvrent l'image"""
+    windows = list(iter_windows(1000, 600, size=512, overlap=64))
+    covered = np.zeros((600, 1000), dtype=bool)
+    for x, y, w, h in windows:
+        assert (w, h) == (512, 512)
+        covered[y:y + h, x:x + w] = True
+    assert covered.all()
+
+def test_to_rgb_uint8_band_range():
+    """Cas : normalisation avec bornes fournies"""
+    window = np.array([[[0, 1000, 2000, 5]]], dtype=np.uint16)
+    band_range = np.array([[0, 0, 0], [2000, 2000, 2000]])
+    rgb = to_rgb_uint8(window, bands=(2, 1, 0), band_range=band_range)
+    assert rgb.dtype == np.uint8
+    assert rgb[0, 0].tolist() == [255, 127, 0]
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,59 @@
+# tests/test_reencode.py
+
+import sys
+import json
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+
+# --- le dossier parent pour que Python trouve reencode.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.reencode import reencode_dataset
+from prepare_data.data_loader import load_coco_annotations
+
+
+# ------------------------------
+# 1/ Test reencode_dataset
+# * PNG => JPEG réduit (côté max 100)
+# * width / height et bbox mis à l'échelle
+# * image illisible ignorée
+# ------------------------------
+def test_reencode_dataset(tmp_path: Path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    rng = np.random.default_rng(0)
+    cv2.imwrite(str(images_dir / "img.png"), rng.integers(0, 255, (100, 200, 3), dtype=np.uint8))
+    (images_dir / "broken.png").write_bytes(b"pas une image")
+    coco = {
+        "images": [
+            {"id": 1, "file_name": "img.png", "width": 200, "height": 100},
+            {"id": 2, "file_name": "broken.png", "width": 10, "height": 10},
+        ],
+        "annotations": [
+            {"id": 1, "image_id": 1, "category_id": 1, "bbox": [20, 10, 40, 30], "area": 1200},
+            {"id": 2, "image_id": 2, "category_id": 1, "bbox": [0, 0, 5, 5], "area": 25},
+        ],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    coco_path = tmp_path / "coco.json"
+    coco_path.write_text(json.dumps(coco))
+
+    report = reencode_dataset(str(coco_path), str(images_dir), str(tmp_path / "out"),
+                              str(tmp_path / "coco_jpg.json"), fmt="jpg", max_side=100, workers=1)
+    result = load_coco_annotations(str(tmp_path / "coco_jpg.json"))
+
+    assert (report["images"], report["skipped"]) == (1, 1)
+    assert result["images"] == [{"id": 1, "file_name": "img.jpg", "width": 100, "height": 50}]
+    assert result["annotations"][0]["bbox"] == [10, 5, 20, 15]
+    assert result["annotations"][0]["area"] == 300
+    assert len(result["annotations"]) == 1
+    assert cv2.imread(str(tmp_path / "out" / "img.jpg")).shape == (50, 100, 3)
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,83 @@
+# tests/test_tiling.py
+
+import sys
+import json
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+import tifffile
+
+# --- le dossier parent pour que Python trouve tiling.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from prepare_data.tiling import clip_boxes_to_tile, tile_dataset
+
+
+# ------------------------------
+# 1/ Tests pour clip_boxes_to_tile
+# * Boîte entièrement dans la tuile => décalée
+# * Boîte coupée au bord => tronquée
+# * Boîte trop peu visible => supprimée
+# ------------------------------
+def test_clip_boxes_to_tile():
+    bboxes = np.array([
+        [110, 110, 20, 20],   # dans la tuile
+        [90, 150, 20, 10],    # à moitié visible
+        [198, 100, 10, 10],   # 20% visible
+    ])
+    boxes, keep = clip_boxes_to_tile(bboxes, 100, 100, 100, 100, min_visibility=0.3)
+    assert keep.tolist() == [True, True, False]
+    assert boxes.tolist() == [[10, 10, 20, 20], [0, 50, 10, 10]]
+
+
+# ------------------------------
+# 2/ Test tile_dataset
+# ------------------------------
+def test_tile_dataset(tmp_path: Path):
+    """Cas : image 200x100 en tuiles 100x100 sans recouvrement, tuile vide écartée"""
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    cv2.imwrite(str(images_dir / "img.png"), np.zeros((100, 200, 3), dtype=np.uint8))
+    coco = {
+        "images": [{"id": 1, "file_name": "img.png", "width": 200, "height": 100}],
+        "annotations": [{"id": 1, "image_id": 1, "category_id": 3, "bbox": [10, 20, 30, 40]}],
+        "categories": [{"id": 3, "name": "fire"}],
+    }
+    coco_path = tmp_path / "coco.json"
+    coco_path.write_text(json.dumps(coco))
+
+    result = tile_dataset(str(coco_path), str(images_dir), str(tmp_path / "out"),
+                          tile_size=100, overlap=0, empty_ratio=0.0, workers=1)
+    assert [img["file_name"] for img in result["images"]] == ["img_0_0.jpg"]
+    assert result["annotations"][0]["bbox"] == [10, 20, 30, 40]
+    label = (tmp_path / "out" / "labels" / "img_0_0.txt").read_text().split()
+    assert label == ["0", "0.250000", "0.400000", "0.300000", "0.400000"]
+    assert (tmp_path / "out" / "images" / "img_0_0.jpg").exists()
+
+def test_tile_dataset_uint16_tiff_normalized(tmp_path: Path):
+    """Cas : GeoTIFF 16 bits (valeurs 500-3500) => tuiles étirées comme à l'inférence, pas noires"""
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    scene = np.linspace(500, 3500, 128 * 128 * 3).astype(np.uint16).reshape(128, 128, 3)
+    tifffile.imwrite(images_dir / "scene.tif", scene, photometric="rgb", tile=(64, 64))
+    coco = {
+        "images": [{"id": 1, "file_name": "scene.tif", "width": 128, "height": 128}],
+        "annotations": [{"id": 1, "image_id": 1, "category_id": 1, "bbox": [10, 10, 30, 30]}],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    coco_path = tmp_path / "coco.json"
+    coco_path.write_text(json.dumps(coco))
+
+    tile_dataset(str(coco_path), str(images_dir), str(tmp_path / "out"), tile_size=128,
+                 overlap=0, workers=1, ext=".png")
+    tile = cv2.imread(str(tmp_path / "out" / "images" / "scene_0_0.png"))
+    assert tile.max() == 255
+    assert 100 < tile.mean() < 155
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
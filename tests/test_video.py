@@ -0,0 +1,74 @@
+# tests/test_video.py
+
+import sys
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+
+# --- le dossier parent pour que Python trouve modeles/video.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+import modeles.video as video
+from modeles.video import (
+    difference_score,
+    changed_region,
+    detect_video
+)
+
+
+# ------------------------------
+# 1/ Tests pour difference_score et changed_region
+# ------------------------------
+def test_difference_score_identical():
+    """Cas : images identiques => score nul"""
+    small = np.full((64, 64), 120, dtype=np.float32)
+    assert difference_score(small, small) == 0.0
+
+def test_changed_region_none():
+    """Cas : aucune modification => pas de zone"""
+    small = np.zeros((64, 64), dtype=np.float32)
+    fraction, box = changed_region(small, small)
+    assert fraction == 0.0
+    assert box is None
+
+def test_changed_region_single_cell():
+    """Cas : une seule cellule modifiée (coin bas droit)"""
+    reference = np.zeros((64, 64), dtype=np.float32)
+    small = reference.copy()
+    small[56:, 56:] = 255
+    fraction, box = changed_region(reference, small, grid=8)
+    assert fraction == pytest.approx(1 / 64)
+    assert box == (7 / 8, 7 / 8, 1.0, 1.0)
+
+
+# ------------------------------
+# 2/ Test detect_video (détecteur simulé)
+# ------------------------------
+def test_detect_video_skips_static_frames(tmp_path: Path, monkeypatch):
+    """Cas : scène statique puis un changement local => une détection complète, une zone, le reste réutilisé"""
+    frame = np.full((128, 128, 3), 80, dtype=np.uint8)
+    for i in range(5):
+        cv2.imwrite(str(tmp_path / f"frame_{i:03d}.png"), frame)
+    changed = frame.copy()
+    changed[:16, :16] = 255
+    cv2.imwrite(str(tmp_path / "frame_005.png"), changed)
+
+    calls = []
+    def fake_predict(model, images, **kwargs):
+        calls.append(images[0].shape)
+        return [np.array([[1, 1, 5, 5, 0.9, 0]], dtype=np.float32)]
+    monkeypatch.setattr(video, "predict_detections", fake_predict)
+
+    records, stats = detect_video(None, str(tmp_path))
+    assert [r["mode"] for r in records] == ["full"] + ["reused"] * 4 + ["region"]
+    assert stats["skip_rate"] == pytest.approx(4 / 6)
+    assert calls[0] == (128, 128, 3)
+    assert calls[1][0] < 128  # la zone recalculée est plus petite que l'image
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
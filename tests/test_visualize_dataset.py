@@ -0,0 +1,110 @@
+# tests/test_visualize_dataset.py
+
+import sys
+import json
+from pathlib import Path
+import cv2
+import numpy as np
+import pytest
+
+# --- le dossier parent pour que Python trouve visualize_dataset.py ---
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+pytest.importorskip("fiftyone")
+
+from prepare_data.visualize_dataset import (
+    build_samples_index,
+    generate_thumbnails,
+    diff_samples
+)
+
+
+def make_coco(tmp_path: Path, bbox=(10, 10, 20, 20)) -> Path:
+    images = tmp_path / "images"
+    images.mkdir(exist_ok=True)
+    for name in ("a.jpg", "b.jpg"):
+        if not (images / name).exists():
+            cv2.imwrite(str(images / name), np.full((64, 96, 3), 128, dtype=np.uint8))
+    coco = {
+        "images": [{"id": 1, "file_name": "a.jpg", "width": 96, "height": 64},
+                   {"id": 2, "file_name": "b.jpg", "width": 96, "height": 64},
+                   {"id": 3, "file_name": "absent.jpg", "width": 96, "height": 64}],
+        "annotations": [{"id": 1, "image_id": 1, "category_id": 1, "bbox": list(bbox)}],
+        "categories": [{"id": 1, "name": "fire"}],
+    }
+    path = tmp_path / "coco.json"
+    path.write_text(json.dumps(coco))
+    return path
+
+
+# ------------------------------
+# 1/ Tests pour build_samples_index
+# * Empreinte stable d'une exécution à l'autre
+# * Empreinte modifiée après édition d'une bbox
+# ------------------------------
+def test_build_samples_index_hash_stable(tmp_path: Path):
+    """Cas : deux constructions successives => mêmes empreintes, image absente ignorée"""
+    coco_path = make_coco(tmp_path)
+    first = build_samples_index(coco_path, tmp_path / "images")
+    second = build_samples_index(coco_path, tmp_path / "images")
+    assert len(first) == 2
+    assert {p: i["hash"] for p, i in first.items()} == {p: i["hash"] for p, i in second.items()}
+
+def test_build_samples_index_hash_changes_on_bbox_edit(tmp_path: Path):
+    """Cas : bbox modifiée => seule l'empreinte de l'image concernée change"""
+    before = build_samples_index(make_coco(tmp_path), tmp_path / "images")
+    after = build_samples_index(make_coco(tmp_path, bbox=(12, 10, 20, 20)), tmp_path / "images")
+    a, b = str((tmp_path / "images" / "a.jpg").resolve()), str((tmp_path / "images" / "b.jpg").resolve())
+    assert before[a]["hash"] != after[a]["hash"]
+    assert before[b]["hash"] == after[b]["hash"]
+
+def test_build_samples_index_hash_changes_on_inplace_rewrite(tmp_path: Path, monkeypatch):
+    """Cas : image réécrite sur place (dossier inchangé), index persistant relu => empreinte modifiée"""
+    import prepare_data.dir_index as dir_index
+    monkeypatch.setattr(dir_index, "INDEX_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(dir_index, "_INDEXES", {})
+    coco_path = make_coco(tmp_path)
+    before = build_samples_index(coco_path, tmp_path / "images")
+
+    image = tmp_path / "images" / "a.jpg"
+    with open(image, "r+b") as f:   # réécriture sur place : la date du dossier ne change pas
+        f.seek(0, 2)
+        f.write(b"\0" * 999)
+    monkeypatch.setattr(dir_index, "_INDEXES", {})  # nouveau processus
+    after = build_samples_index(coco_path, tmp_path / "images")
+    assert before[str(image.resolve())]["hash"] != after[str(image.resolve())]["hash"]
+
+
+# ------------------------------
+# 2/ Test generate_thumbnails : cache des miniatures
+# ------------------------------
+def test_generate_thumbnails_cached(tmp_path: Path, capsys):
+    """Cas : second appel => aucune miniature régénérée"""
+    index = build_samples_index(make_coco(tmp_path), tmp_path / "images")
+    thumbs_dir = tmp_path / "thumbs"
+    thumbnails = generate_thumbnails(index, thumbs_dir, height=32, workers=1)
+    assert all(cv2.imread(t).shape[0] == 32 for t in thumbnails.values())
+    capsys.readouterr()
+
+    assert generate_thumbnails(index, thumbs_dir, height=32, workers=1) == thumbnails
+    assert "0 générées, 2 en cache" in capsys.readouterr().out
+
+
+# ------------------------------
+# 3/ Test diff_samples : ajoutés / modifiés / supprimés
+# ------------------------------
+def test_diff_samples_split():
+    """Cas : un échantillon inchangé, un modifié, un supprimé, un nouveau"""
+    existing = {"/a.jpg": ("id_a", "h1"), "/b.jpg": ("id_b", "old"), "/c.jpg": ("id_c", "h3")}
+    index = {"/a.jpg": {"hash": "h1"}, "/b.jpg": {"hash": "new"}, "/d.jpg": {"hash": "h4"}}
+    added, changed, removed = diff_samples(existing, index)
+    assert added == ["/d.jpg"]
+    assert changed == {"id_b": "/b.jpg"}
+    assert removed == ["id_c"]
+
+
+# ------------------------------
+#  pytest : cmd terminal
+# ------------------------------
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])